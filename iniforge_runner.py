@@ -1,3 +1,4 @@
 from src.iniforge import gui
-    
-gui.main()
+
+if __name__ == '__main__':
+    gui.main()
@@ -22,11 +22,9 @@ setup(
     setup_requires=['wheel'],
     include_package_data=True,
     install_requires=[
-        "configparser",
         "PySide6==6.2.4",
         "shiboken6==6.2.4",
         "coloredlogs==15.0.1",
-        "numpy<2",
         "pyperclip"
     ],
     package_data={
@@ -41,7 +39,8 @@ setup(
     },
     entry_points={
         'console_scripts': [
-            'iniforge = iniforge.gui:main'
+            'iniforge = iniforge.gui:main',
+            'iniforge-cli = iniforge.cli:main'
         ]
     }
 )
@@ -0,0 +1,122 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from . import core
+
+DEFAULT_WORKERS = 4
+
+class BulkResult:
+    """Summary of a bulk apply run."""
+
+    def __init__(self, total):
+        self.total = total
+        self.changed = []  # Files actually written
+        self.unchanged = []  # Files the plan did not alter, left untouched
+        self.failed = []  # (file_path, error message)
+        self.substitutions = {}  # file_path -> regex substitutions made, for plans with a regex replace
+        self.cancelled = False
+        self.elapsed = 0.0
+
+    @property
+    def processed(self):
+        return len(self.changed) + len(self.unchanged) + len(self.failed)
+
+    def summary(self):
+        text = (f"Modified: {len(self.changed)}, unchanged: {len(self.unchanged)}, "
+                f"failed: {len(self.failed)} of {self.total} files in {self.elapsed:.1f}s")
+        if self.substitutions:
+            text += f", {sum(self.substitutions.values())} substitutions"
+        if self.cancelled:
+            text += f" (cancelled after {self.processed} files)"
+        return text
+
+    def to_dict(self):
+        return {
+            'total': self.total,
+            'modified': len(self.changed),
+            'changed': self.changed,
+            'unchanged': self.unchanged,
+            'failed': [{'file': file_path, 'error': error} for file_path, error in self.failed],
+            'substitutions': self.substitutions,
+            'cancelled': self.cancelled,
+            'elapsed': round(self.elapsed, 3),
+        }
+
+class BulkApplyExecutor:
+    """Applies a plan (list of core operations) to many files with bounded parallel I/O.
+
+    Each file is read, transformed by every step of the plan and written once.
+    Files are processed on a small thread pool with only a few files in flight per
+    worker. Cancellation stops submitting new files; files already being written
+    are finished, so no file is left half-written.
+    """
+
+    def __init__(self, operations, workers=DEFAULT_WORKERS, journal=None, recorder=None, streaming_threshold=None,
+                 dry_run=False):
+        self.operations = operations
+        self.workers = workers if workers and workers > 0 else DEFAULT_WORKERS
+        self.journal = journal  # ApplyJournal recording progress, so the run can be resumed after a crash
+        self.recorder = recorder  # HistoryRecorder keeping the deltas needed to undo the run
+        self.streaming_threshold = streaming_threshold  # Larger files (bytes) are edited as a stream
+        self.dry_run = dry_run  # Only report the files the plan would modify, write nothing
+
+    def plan_for(self, file_path):
+        """Operations to run on a file, the same plan for every file here."""
+        return self.operations
+
+    def apply_file(self, file_path):
+        counts = {}
+        if self.dry_run:
+            return core.preview_plan(file_path, self.plan_for(file_path), counts), counts
+        changed = core.apply_plan(file_path, self.plan_for(file_path),
+                                  self.journal.intent if self.journal else None,
+                                  self.recorder.record if self.recorder else None,
+                                  self.streaming_threshold, counts)
+        return changed, counts
+
+    def run(self, file_paths, on_progress=None, is_cancelled=None):
+        """Apply the plan to every path and return a BulkResult.
+
+        on_progress(done, total, file_path, files_per_second) is called after each file,
+        in the calling thread. The journal, if any, is closed when the run ends and
+        removed unless the run was interrupted by an exception.
+        """
+        is_cancelled = is_cancelled or (lambda: False)
+        result = BulkResult(len(file_paths))
+        started = time.monotonic()
+
+        def record(file_path, future):
+            try:
+                changed, counts = future.result()
+            except Exception as e:
+                result.failed.append((file_path, str(e)))
+            else:
+                (result.changed if changed else result.unchanged).append(file_path)
+                if changed and counts.get('substitutions'):
+                    result.substitutions[file_path] = counts['substitutions']
+                if self.journal:
+                    self.journal.commit(file_path, changed)
+            if on_progress:
+                elapsed = time.monotonic() - started
+                on_progress(result.processed, result.total, file_path, result.processed / elapsed if elapsed else 0.0)
+
+        in_flight = deque()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='iniforge-apply') as executor:
+                for file_path in file_paths:
+                    if is_cancelled():
+                        result.cancelled = True
+                        break
+                    in_flight.append((file_path, executor.submit(self.apply_file, file_path)))
+                    if len(in_flight) >= self.workers * 2:
+                        record(*in_flight.popleft())
+                while in_flight:
+                    record(*in_flight.popleft())
+        finally:
+            if self.journal:
+                self.journal.close()
+        if self.journal:
+            self.journal.finish()
+
+        result.elapsed = time.monotonic() - started
+        return result
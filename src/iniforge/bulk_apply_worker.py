@@ -0,0 +1,34 @@
+import time
+from PySide6.QtCore import QThread, Signal
+
+class BulkApplyWorker(QThread):
+    # files done, files total, current file, files per second
+    progress = Signal(int, int, str, float)
+    # BulkResult
+    signal = Signal(object)
+
+    PROGRESS_INTERVAL = 0.1  # seconds
+
+    def __init__(self, executor, file_paths):
+        super().__init__()
+        self.executor = executor  # BulkApplyExecutor, or one of its subclasses (undo/redo)
+        self.file_paths = file_paths
+        self._is_cancelled = False
+        self._last_progress = 0.0
+
+    def run(self):
+        result = self.executor.run(self.file_paths, self.report_progress, self.is_cancelled)
+        self.signal.emit(result)
+
+    def report_progress(self, done, total, file_path, rate):
+        # Throttled, a signal per file would flood the GUI event queue on large selections
+        now = time.monotonic()
+        if done == total or now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.progress.emit(done, total, file_path, rate)
+
+    def is_cancelled(self):
+        return self._is_cancelled or self.isInterruptionRequested()
+
+    def cancel(self):
+        self._is_cancelled = True
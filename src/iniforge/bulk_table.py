@@ -0,0 +1,120 @@
+import os
+import csv
+import json
+from fnmatch import fnmatchcase
+from .bulk_apply import BulkApplyExecutor
+
+COLUMNS = ('file', 'section', 'key', 'value')
+GLOB_CHARS = '*?['
+
+class TableError(Exception):
+    """The table file cannot be read or a row is incomplete."""
+
+def load_table(table_path):
+    """Rows of a CSV or JSON edit table, as dicts with file, section, key, value and action.
+
+    CSV needs a header with the columns file, section, key and value, plus an
+    optional action column (set, the default, or delete). JSON is either a list
+    of such objects or a nested {file: {section: {key: value}}} mapping, where a
+    null value deletes the key.
+    """
+    try:
+        if table_path.lower().endswith('.json'):
+            with open(table_path, 'r', encoding='utf-8') as f:
+                rows = _json_rows(json.load(f))
+        else:
+            with open(table_path, 'r', encoding='utf-8-sig', newline='') as f:
+                reader = csv.DictReader(f)
+                missing = [column for column in COLUMNS[:3] if column not in (reader.fieldnames or ())]
+                if missing:
+                    raise TableError(f"Missing column(s): {', '.join(missing)}")
+                rows = list(reader)
+    except (OSError, ValueError, csv.Error) as e:
+        raise TableError(str(e)) from e
+    return [_normalize_row(row, number) for number, row in enumerate(rows, start=1)]
+
+def _json_rows(data):
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict):
+        raise TableError("JSON table must be a list of rows or a {file: {section: {key: value}}} mapping")
+    rows = []
+    for file_key, sections in data.items():
+        if not isinstance(sections, dict):
+            raise TableError(f"File '{file_key}': expected a {{section: {{key: value}}}} mapping")
+        for section, keys in sections.items():
+            if not isinstance(keys, dict):
+                raise TableError(f"File '{file_key}', section '{section}': expected a {{key: value}} mapping")
+            rows.extend({'file': file_key, 'section': section, 'key': key, 'value': value,
+                         'action': 'delete' if value is None else 'set'}
+                        for key, value in keys.items())
+    return rows
+
+def _normalize_row(row, number):
+    if not isinstance(row, dict):
+        raise TableError(f"Row {number}: expected an object with {', '.join(COLUMNS)}")
+    file_key, section, key = (str(row.get(column) or '').strip() for column in COLUMNS[:3])
+    if not file_key or not section or not key:
+        raise TableError(f"Row {number}: file, section and key are required")
+    action = str(row.get('action') or 'set').strip().lower()
+    if action not in ('set', 'delete'):
+        raise TableError(f"Row {number}: unknown action '{action}'")
+    value = row.get('value')
+    return {'file': file_key, 'section': section, 'key': key,
+            'value': '' if value is None else str(value), 'action': action}
+
+def row_operation(row):
+    if row['action'] == 'delete':
+        return {'type': 'delete_key', 'section': row['section'], 'key': row['key']}
+    return {'type': 'set_key', 'section': row['section'], 'key': row['key'], 'value': row['value']}
+
+class BulkTable:
+    """Maps table rows onto workspace files and builds one plan per file.
+
+    A row's file column is either a glob, matched against the path relative to
+    the workspace and against the file name ignoring case (as the extension
+    filter does), or a file key: the relative path, the file name or the name
+    without extension (a host name, typically), compared exactly.
+    File keys are looked up in an index built in a single pass over the files,
+    so only glob rows cost a test per file.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def plans(self, folder_path, file_paths):
+        """({path: [operations in row order]}, [rows that matched no file])."""
+        files = []
+        index = {}
+        for file_path in file_paths:
+            relative = os.path.relpath(file_path, folder_path).replace(os.sep, '/')
+            name = os.path.basename(file_path)
+            files.append((file_path, relative.casefold(), name.casefold()))
+            for file_key in {relative, name, os.path.splitext(name)[0]}:
+                index.setdefault(file_key, []).append(file_path)
+
+        matches = {}  # path -> [operation]
+        unmatched = []
+        for row in self.rows:
+            pattern = row['file'].replace('\\', '/')
+            if any(char in pattern for char in GLOB_CHARS):
+                pattern = pattern.casefold()
+                targets = [file_path for file_path, relative, name in files
+                           if fnmatchcase(relative, pattern) or fnmatchcase(name, pattern)]
+            else:
+                targets = index.get(pattern, [])
+            if not targets:
+                unmatched.append(row)
+            for file_path in dict.fromkeys(targets):
+                matches.setdefault(file_path, []).append(row_operation(row))
+        return matches, unmatched
+
+class TableExecutor(BulkApplyExecutor):
+    """Bulk apply where every file has its own plan, built from a BulkTable."""
+
+    def __init__(self, plans, workers=0, journal=None, recorder=None, streaming_threshold=None, dry_run=False):
+        super().__init__(None, workers, journal, recorder, streaming_threshold, dry_run)
+        self.plans = plans
+
+    def plan_for(self, file_path):
+        return self.plans[file_path]
@@ -0,0 +1,239 @@
+import os
+import re
+import sys
+import json
+import argparse
+from . import core
+from .inventory import WorkspaceInventory
+from .bulk_apply import BulkApplyExecutor, DEFAULT_WORKERS
+# Headless batch mode. Never import Qt (or gui) here: only the Qt-free layers are used, and the
+# ones a run may not need (filter engine, tables, journal) are imported when it needs them.
+
+# Fields every operation type needs in a plan file
+REQUIRED_FIELDS = {
+    'insert': ('section', 'config_lines'),
+    'replace': ('filter_text', 'replace_text'),
+    'remove': ('filter_text',),
+    'regex_replace': ('pattern', 'replacement'),
+    'set_key': ('section', 'key', 'value'),
+    'delete_key': ('section', 'key'),
+    'rename_key': ('section', 'key', 'new_key'),
+    'rename_section': ('section', 'new_section'),
+}
+FLAG_FIELDS = ('add_at_start', 'include_blank', 'ignore_case')
+
+EXIT_OK = 0
+EXIT_FAILED = 1  # Some files could not be processed; bad arguments, plans or tables exit with 2 (argparse)
+
+class PlanError(Exception):
+    """The plan file cannot be read or an operation in it is invalid."""
+
+def load_plan(plan_path):
+    """(operations, filter settings) of a plan file.
+
+    A plan is either a list of operations or an object with an 'operations'
+    list and an optional 'filter' object (name, content, regex,
+    include_blank_lines). Files ending in .yaml or .yml are read with PyYAML,
+    everything else as JSON.
+    """
+    try:
+        with open(plan_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except OSError as e:
+        raise PlanError(str(e)) from e
+
+    if plan_path.lower().endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError:
+            raise PlanError("YAML plans need PyYAML (pip install pyyaml), or write the plan as JSON") from None
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise PlanError(f"Invalid YAML: {e}") from e
+    else:
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise PlanError(f"Invalid JSON: {e}") from e
+
+    if isinstance(data, list):
+        data = {'operations': data}
+    if not isinstance(data, dict) or not isinstance(data.get('operations', []), list):
+        raise PlanError("A plan is a list of operations or an object with an 'operations' list")
+    filter_settings = data.get('filter') or {}
+    if not isinstance(filter_settings, dict):
+        raise PlanError("'filter' must be an object")
+    operations = [normalize_operation(operation, number)
+                  for number, operation in enumerate(data.get('operations') or [], start=1)]
+    return operations, filter_settings
+
+def normalize_operation(operation, number):
+    """Plan entry as the operation dict core expects, with defaults filled in."""
+    if not isinstance(operation, dict):
+        raise PlanError(f"Operation {number}: expected an object")
+    kind = operation.get('type')
+    if kind not in REQUIRED_FIELDS:
+        raise PlanError(f"Operation {number}: unknown type {kind!r}, expected one of {', '.join(REQUIRED_FIELDS)}")
+    missing = [field for field in REQUIRED_FIELDS[kind] if operation.get(field) is None]
+    if missing:
+        raise PlanError(f"Operation {number} ({kind}): missing {', '.join(missing)}")
+
+    normalized = {'type': kind}
+    for field in REQUIRED_FIELDS[kind]:
+        value = operation[field]
+        if field == 'config_lines':
+            # A string or a list of lines; blank lines dropped and newlines added, as in the GUI
+            lines = value.splitlines() if isinstance(value, str) else [str(line) for line in value]
+            value = [line if line.endswith('\n') else f"{line}\n" for line in lines if line.strip()]
+            if not value:
+                raise PlanError(f"Operation {number} (insert): config_lines is empty")
+        else:
+            value = str(value)  # YAML reads numbers and booleans in values as such
+        normalized[field] = value
+    for flag in FLAG_FIELDS:
+        normalized[flag] = bool(operation.get(flag, False))
+
+    if kind == 'regex_replace':
+        try:
+            core.compile_replacement_regex(normalized['pattern'], normalized['ignore_case'])
+        except re.error as e:
+            raise PlanError(f"Operation {number} (regex_replace): invalid regex: {e}") from e
+        try:
+            core.check_regex_replacement(normalized['pattern'], normalized['replacement'], normalized['ignore_case'])
+        except re.error as e:
+            raise PlanError(f"Operation {number} (regex_replace): invalid replacement: {e}") from e
+    return normalized
+
+def filter_files(inventory, file_filter_text='', content_text='', regex=None, include_blank_lines=False,
+                 workers=0, use_processes=False):
+    """Paths of the inventory files matching the name regex and the content filter, in inventory order."""
+    name_regex = re.compile(file_filter_text or '.*', re.IGNORECASE)
+    candidates = [entry.path for entry in inventory.entries() if name_regex.search(entry.name)]
+    if not content_text and not regex:
+        return candidates
+
+    from .filter_engine import ContentFilter, filter_paths  # Pulls in multiprocessing, only when content is filtered
+    content_filter = ContentFilter(content_text, content_text.splitlines() if content_text else [], regex,
+                                   bool(regex), include_blank_lines)
+    return [file_path for file_path, matched in filter_paths(content_filter, candidates, workers, use_processes)
+            if matched]
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='iniforge-cli',
+        description="iniForge headless batch mode: apply an operation plan (JSON or YAML) or an edit table "
+                    "to the configuration files of a folder and print the results as JSON.")
+    parser.add_argument('folder', nargs='?', help="Workspace folder to scan")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('-p', '--plan', help="Plan file: a JSON/YAML list of operations, or an object with "
+                                             "'operations' and an optional 'filter'")
+    source.add_argument('-t', '--table', help="CSV or JSON edit table (file, section, key, value, action)")
+    source.add_argument('--resume', metavar='JOURNAL', help="Resume the interrupted run recorded in a journal")
+    parser.add_argument('-e', '--extensions', default='ini',
+                        help="Comma separated file extensions to scan (default: %(default)s)")
+    parser.add_argument('-n', '--name', help="Only files whose name matches this regex (case-insensitive)")
+    parser.add_argument('-c', '--content', help="Only files containing every line of this text")
+    parser.add_argument('-r', '--regex', help="Only files whose content matches this regex (replaces --content)")
+    parser.add_argument('--include-blank-lines', action='store_true', default=None,
+                        help="Match --content as one block, blank lines included")
+    parser.add_argument('-w', '--workers', type=int, default=0,
+                        help=f"Threads writing files (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--filter-workers', type=int, default=0,
+                        help="Threads or processes reading files for the content filter (default: CPU based)")
+    parser.add_argument('--processes', action='store_true',
+                        help="Filter content in worker processes instead of threads (regex-heavy scans)")
+    parser.add_argument('--streaming-threshold-mb', type=int, default=64,
+                        help="Edit files larger than this as a stream, 0 disables streaming (default: %(default)s)")
+    parser.add_argument('--journal', help="Write a journal of the run here, so an interrupted run can be resumed")
+    parser.add_argument('--dry-run', action='store_true', help="Report the files the plan would modify, write nothing")
+    parser.add_argument('--indent', type=int, default=None, help="Indent the JSON output")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    streaming_threshold = args.streaming_threshold_mb * 1024 * 1024 or None
+
+    if args.resume:
+        report = resume_run(parser, args, streaming_threshold)
+    else:
+        if not args.folder:
+            parser.error("the folder is required (unless resuming with --resume)")
+        if not os.path.isdir(args.folder):
+            parser.error(f"not a folder: {args.folder}")
+        report = new_run(parser, args, streaming_threshold)
+
+    json.dump(report, sys.stdout, indent=args.indent)
+    sys.stdout.write('\n')
+    return EXIT_FAILED if report.get('failed') else EXIT_OK
+
+def new_run(parser, args, streaming_threshold):
+    operations, filter_settings = [], {}
+    if args.plan:
+        try:
+            operations, filter_settings = load_plan(args.plan)
+        except PlanError as e:
+            parser.error(f"{args.plan}: {e}")
+    name = args.name if args.name is not None else filter_settings.get('name', '')
+    content = args.content if args.content is not None else filter_settings.get('content', '')
+    regex = args.regex if args.regex is not None else filter_settings.get('regex')
+    include_blank = (args.include_blank_lines if args.include_blank_lines is not None
+                     else bool(filter_settings.get('include_blank_lines', False)))
+    try:
+        re.compile(name or '')
+        if regex:
+            re.compile(regex)
+    except re.error as e:
+        parser.error(f"invalid regex: {e}")
+
+    folder = os.path.abspath(args.folder)
+    inventory = WorkspaceInventory().scan(folder, args.extensions.split(','))
+    file_paths = filter_files(inventory, name, content or '', regex, include_blank,
+                              args.filter_workers, args.processes)
+    report = {'folder': folder, 'scanned': len(inventory), 'matched': len(file_paths)}
+    if not args.plan and not args.table:
+        report['files'] = file_paths  # Nothing to apply, list the files the filters select
+        return report
+
+    plans = None
+    if args.table:
+        from .bulk_table import BulkTable, TableError, load_table
+        try:
+            rows = load_table(args.table)
+        except TableError as e:
+            parser.error(f"{args.table}: {e}")
+        plans, unmatched = BulkTable(rows).plans(folder, file_paths)
+        file_paths = [file_path for file_path in file_paths if file_path in plans]
+        report['unmatched_rows'] = unmatched
+
+    journal = None
+    if args.journal and not args.dry_run:
+        from .journal import ApplyJournal
+        journal = ApplyJournal.create(args.journal, operations, file_paths, plans)
+    executor = make_executor(operations, plans, args, journal, streaming_threshold)
+    report['dry_run'] = args.dry_run
+    report.update(executor.run(file_paths).to_dict())
+    return report
+
+def resume_run(parser, args, streaming_threshold):
+    from .journal import ApplyJournal
+    journal = ApplyJournal.load(args.resume, core.file_text_digest)
+    if journal is None:
+        parser.error(f"no interrupted run in {args.resume}")
+    # A dry run leaves the journal as it is, for the real resume
+    file_paths = journal.remaining() if args.dry_run else journal.resume()
+    report = {'resumed': args.resume, 'dry_run': args.dry_run}
+    executor = make_executor(journal.operations, journal.plans, args, None if args.dry_run else journal,
+                             streaming_threshold)
+    report.update(executor.run(file_paths).to_dict())
+    return report
+
+def make_executor(operations, plans, args, journal, streaming_threshold):
+    if plans is not None:
+        from .bulk_table import TableExecutor
+        return TableExecutor(plans, args.workers, journal, None, streaming_threshold, args.dry_run)
+    return BulkApplyExecutor(operations, args.workers, journal, None, streaming_threshold, args.dry_run)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,127 +1,547 @@
 import os
-import configparser
-
-def get_config_sections(folder_path, extensions):
-    all_sections = set()
-    print(f"Reading available sections from {folder_path}...", end="", flush=True)
-    for root, _, files in os.walk(folder_path):
-        for file in files:
-            if any(file.lower().endswith(f'.{ext}') for ext in extensions):
-                file_path = os.path.join(root, file)
-                config = configparser.ConfigParser()
-                try:
-                    config.read(file_path)
-                    all_sections.update(config.sections())
-                except Exception:
-                    pass
-    print("[OK]")
-    return sorted(all_sections)
+import re
+import mmap
+import locale
+import hashlib
+import tempfile
+from functools import lru_cache
+from contextlib import contextmanager
+from .section_layout import SectionLayout, InsertionBatch, insert_lines, split_lines
+from .ini_model import IniDocument, OPERATION_TYPES as STRUCTURED_TYPES
+
+# Encoding used by open() in text mode, needles are encoded the same way for byte-level search
+ENCODING = locale.getpreferredencoding(False)
+
+# Read size of the streaming edit path (stream_plan), also bounds its memory use
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+@contextmanager
+def mapped_file(file_path):
+    """Read-only view of a file's raw bytes, memory-mapped unless the file is empty."""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield view
+
+def decode_text(data):
+    """Decode raw bytes the way a text-mode read would (locale encoding, universal newlines)."""
+    return bytes(data).decode(ENCODING).replace('\r\n', '\n').replace('\r', '\n')
+
+def encode_needles(texts):
+    """Encode search texts for byte-level matching, or None if the encoding cannot represent them."""
+    try:
+        return [text.encode(ENCODING) for text in texts]
+    except UnicodeEncodeError:
+        return None
+
+def file_may_contain(file_path, texts):
+    """Byte-level pre-check that every text occurs in the file, without decoding it.
+
+    Returns False only when the file certainly lacks one of the texts.
+    """
+    needles = encode_needles(texts)
+    if needles is None:
+        return True
+    with mapped_file(file_path) as data:
+        if all(data.find(needle) != -1 for needle in needles):
+            return True
+        # Text-mode reads translate \r\n, multi-line texts need the decoded content to decide
+        return any('\n' in text for text in texts) and data.find(b'\r') != -1
+
+# Same header rule as configparser: optional indent, '[', name up to the last ']' on the line
+SECTION_HEADER_RE = re.compile(rb'^[ \t]*\[([^\r\n]+)\]', re.MULTILINE)
+
+def iter_section_headers(data):
+    """Yield (line_index, name) for every [section] header in raw ini bytes.
+
+    Only header lines are looked at, so files configparser rejects (duplicate
+    sections, keys before the first header, ...) still report their sections.
+    Line indexes are 0-based.
+    """
+    line_index = 0
+    position = 0
+    for match in SECTION_HEADER_RE.finditer(data):
+        line_index += data.count(b'\n', position, match.start())
+        position = match.start()
+        yield line_index, match.group(1).decode(ENCODING, errors='replace')
+
+def section_names(data):
+    """Unique section names of raw ini bytes, in file order (DEFAULT excluded, as in configparser)."""
+    names = dict.fromkeys(name for _, name in iter_section_headers(data))
+    names.pop('DEFAULT', None)
+    return list(names)
 
 def get_section_line_index(content, section, add_at_start=False):
-    start_of_section = None
-    end_of_section = None
-
-    for i, line in enumerate(content):
-        if f"[{section}]" == line.strip():
-            start_of_section = i + 1
-            
-            # Skip any comment lines at the start of the section
-            while start_of_section < len(content) and content[start_of_section].strip().startswith(';'):
-                start_of_section += 1
-            
-            if add_at_start:
-                return start_of_section, True
-            
-            # Find the end of this section
-            end_of_section = start_of_section
-            while end_of_section < len(content):
-                if content[end_of_section].strip().startswith('['):
-                    break
-                end_of_section += 1
-            
-            # If we found the end of the section, return the last line of the section
-            if end_of_section > start_of_section:
-                return end_of_section, True
-            return start_of_section, True
-
-    # If section not found, return the end of file
-    return len(content), False
+    """(line index to insert at, section found) for a list of lines, see SectionLayout."""
+    return SectionLayout(content).insertion_index(section, add_at_start)
 
-def process_insertion(file_path, section, config_lines, add_at_start):
-    with open(file_path, 'r') as f:
-        content = f.readlines()
-    
-    line_index, section_found = get_section_line_index(content, section, add_at_start)
-    
-    if not section_found:
-        # Section doesn't exist, add it at the end of file
-        # Add a newline before the section if file is not empty and doesn't end with newline
-        if content and not content[-1].endswith('\n'):
-            content.append('\n')
-        # Add section header and content
-        content.append(f"[{section}]\n")
-        content.extend(config_lines)
-    else:
-        # Section exists, insert content at the appropriate position
-        if line_index == len(content)-1:  # If at end of file
-            content.append('\n')  # Add newline before content
-        content[line_index:line_index] = config_lines  # Insert content at line_index
-    
-    with open(file_path, 'w') as f:
-        f.writelines(content)
+def _search_texts(filter_text, include_blank):
+    """Texts that must all be present for a replacement/removal to change the file."""
+    if include_blank:
+        return [filter_text]
+    filter_lines = [l for l in filter_text.splitlines() if l.strip()]
+    if len(filter_lines) == 1:
+        return filter_lines
+    return [filter_text]
 
-def process_replacement(file_path, filter_text, replace_text, include_blank):
-    with open(file_path, 'r') as f:
-        content = f.read()
+def transform_insertion(content, section, config_lines, add_at_start):
+    """Return content with config_lines added to section (created at the end of file if missing)."""
+    content = split_lines(content)
+    insert_lines(content, section, config_lines, add_at_start)
+    return ''.join(content)
 
+def transform_insertions(content, operations):
+    """Return content with several insert operations applied in order, laying the file out only once."""
+    batch = InsertionBatch(split_lines(content))
+    for operation in operations:
+        batch.insert(operation['section'], operation['config_lines'], operation['add_at_start'])
+    return ''.join(batch.lines())
+
+def transform_replacement(content, filter_text, replace_text, include_blank):
+    """Return content with filter_text replaced, or None if filter_text does not apply."""
     if include_blank:
         # Treat filter_text as single string including blank lines
-        if filter_text in content:
-            content = content.replace(filter_text, replace_text)
-            with open(file_path, 'w') as f:
-                f.write(content)
-    else:
-        # Split by lines
-        filter_lines = filter_text.splitlines()
-        replace_lines = replace_text.splitlines()
-        filter_lines  = [l for l in filter_lines if l.strip()]
-        
-        if len(filter_lines) == 1:
-            if all(line in content for line in filter_lines):
-                for line in filter_lines:
-                    if replace_lines:
-                        content = content.replace(line, "\n".join(replace_lines))
-                    else:
-                        content = content.replace(line, '')
-                with open(file_path, 'w') as f:
-                    f.write(content)
-        else:
-            content = content.replace(filter_text, replace_text)
-            with open(file_path, 'w') as f:
-                f.write(content)
+        if filter_text not in content:
+            return None
+        return content.replace(filter_text, replace_text)
 
-def process_removal(file_path, filter_text, include_blank):
-    with open(file_path, 'r') as f:
-        content = f.read()
+    # Split by lines
+    filter_lines = filter_text.splitlines()
+    replace_lines = replace_text.splitlines()
+    filter_lines  = [l for l in filter_lines if l.strip()]
+    
+    if len(filter_lines) == 1:
+        if not all(line in content for line in filter_lines):
+            return None
+        for line in filter_lines:
+            if replace_lines:
+                content = content.replace(line, "\n".join(replace_lines))
+            else:
+                content = content.replace(line, '')
+        return content
+    return content.replace(filter_text, replace_text)
 
+def transform_removal(content, filter_text, include_blank):
+    """Return content with filter_text removed, or None if filter_text does not apply."""
     if include_blank:
         # Treat filter_text as single string including blank lines
-        if filter_text in content:
-            content = content.replace(filter_text, '')
-            with open(file_path, 'w') as f:
-                f.write(content)
-    else:
-        # Original behavior: split by lines
-        filter_lines = filter_text.splitlines()
-        filter_lines  = [l for l in filter_lines if l.strip()]
-        
-        if len(filter_lines) == 1:
-            if all(line in content for line in filter_lines):
-                for line in filter_lines:
-                    content = content.replace(f"{line}\n", '')
-                with open(file_path, 'w') as f:
-                    f.write(content)
+        if filter_text not in content:
+            return None
+        return content.replace(filter_text, '')
+
+    # Original behavior: split by lines
+    filter_lines = filter_text.splitlines()
+    filter_lines  = [l for l in filter_lines if l.strip()]
+    
+    if len(filter_lines) == 1:
+        if not all(line in content for line in filter_lines):
+            return None
+        for line in filter_lines:
+            content = content.replace(f"{line}\n", '')
+        return content
+    return content.replace(f"{filter_text}\n", '')
+
+@lru_cache(maxsize=64)
+def compile_replacement_regex(pattern, ignore_case):
+    """Compiled once per pattern for a whole bulk run (and shared by its threads)."""
+    return re.compile(pattern, re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+
+def check_regex_replacement(pattern, replacement, ignore_case):
+    """Raise re.error if the pattern or the replacement template (escapes, group references) is invalid.
+
+    Checked once up front, instead of failing in subn() for every file of a run.
+    """
+    regex = compile_replacement_regex(pattern, ignore_case)
+    try:
+        regex.sub(replacement, '')  # The template is parsed even when nothing matches
+    except IndexError as e:  # Unknown group name
+        raise re.error(str(e)) from e
+
+def transform_regex_replacement(content, pattern, replacement, ignore_case, counts=None):
+    """Return content with every match of pattern substituted (backreferences allowed), or None if none matched.
+
+    The number of substitutions is added to counts['substitutions'] when a dict is given.
+    """
+    new_content, substitutions = compile_replacement_regex(pattern, ignore_case).subn(replacement, content)
+    if counts is not None:
+        counts['substitutions'] = counts.get('substitutions', 0) + substitutions
+    return new_content if substitutions else None
+
+def transform_structured(content, operations):
+    """Return content with key-level operations applied on one parsed IniDocument, or None if none applied."""
+    document = IniDocument(content)
+    changed = False
+    for operation in operations:
+        changed = document.apply(operation) or changed
+    return document.text() if changed else None
+
+def transform(content, operation, counts=None):
+    """Apply one operation dict to text. Returns the new text, or None if it does not apply.
+
+    Operations are plain dicts so they can be queued, logged or sent to another process:
+        {'type': 'insert', 'section': str, 'config_lines': [str], 'add_at_start': bool}
+        {'type': 'replace', 'filter_text': str, 'replace_text': str, 'include_blank': bool}
+        {'type': 'remove', 'filter_text': str, 'include_blank': bool}
+        {'type': 'regex_replace', 'pattern': str, 'replacement': str, 'ignore_case': bool}
+    and the key-level operations of IniDocument.apply (set_key, delete_key,
+    rename_key, rename_section).
+    """
+    kind = operation['type']
+    if kind == 'regex_replace':
+        return transform_regex_replacement(content, operation['pattern'], operation['replacement'],
+                                           operation.get('ignore_case', False), counts)
+    if kind in STRUCTURED_TYPES:
+        return transform_structured(content, [operation])
+    if kind == 'insert':
+        return transform_insertion(content, operation['section'], operation['config_lines'], operation['add_at_start'])
+    if kind == 'replace':
+        return transform_replacement(content, operation['filter_text'], operation['replace_text'], operation['include_blank'])
+    if kind == 'remove':
+        return transform_removal(content, operation['filter_text'], operation['include_blank'])
+    raise ValueError(f"Unknown operation type: {kind}")
+
+def _batch_kind(operation):
+    if operation['type'] == 'insert':
+        return 'insert'
+    if operation['type'] in STRUCTURED_TYPES:
+        return 'structured'
+    return None
+
+def transform_plan(content, operations, counts=None):
+    """Apply a list of operations to text in order. Returns the new text (unchanged if nothing applied).
+
+    Consecutive insertions share one section layout, and consecutive key-level
+    operations one parsed document, instead of rescanning the file for each.
+    """
+    index = 0
+    while index < len(operations):
+        batch = _batch_kind(operations[index])
+        if batch:
+            end = index
+            while end < len(operations) and _batch_kind(operations[end]) == batch:
+                end += 1
+            if batch == 'insert':
+                content = transform_insertions(content, operations[index:end])
+            else:
+                content = transform_structured(content, operations[index:end]) or content
+            index = end
+            continue
+        new_content = transform(content, operations[index], counts)
+        if new_content is not None:
+            content = new_content
+        index += 1
+    return content
+
+def describe_operation(operation):
+    """One line, human readable summary of an operation dict."""
+    kind = operation['type']
+    if kind == 'insert':
+        where = "start" if operation['add_at_start'] else "end"
+        lines = "".join(operation['config_lines']).strip().replace('\n', ' | ')
+        return f"Add to [{operation['section']}] ({where}): {lines}"
+    if kind == 'replace':
+        return f"Replace: {operation['filter_text'].strip()} -> {operation['replace_text'].strip()}".replace('\n', ' | ')
+    if kind == 'remove':
+        return f"Remove: {operation['filter_text'].strip()}".replace('\n', ' | ')
+    if kind == 'regex_replace':
+        return f"Regex replace: {operation['pattern']} -> {operation['replacement']}".replace('\n', ' | ')
+    if kind == 'set_key':
+        return f"Set [{operation['section']}] {operation['key']} = {operation['value']}"
+    if kind == 'delete_key':
+        return f"Delete [{operation['section']}] {operation['key']}"
+    if kind == 'rename_key':
+        return f"Rename [{operation['section']}] {operation['key']} -> {operation['new_key']}"
+    if kind == 'rename_section':
+        return f"Rename [{operation['section']}] -> [{operation['new_section']}]"
+    return kind
+
+def _plan_may_apply(file_path, operations):
+    """Byte-level pre-check: False when no operation of the plan can change the file.
+
+    A later step can only find text an earlier step produced if that earlier step
+    applied, so checking every step against the original bytes is enough.
+    """
+    for operation in operations:
+        kind = operation['type']
+        if kind in ('replace', 'remove'):
+            texts = _search_texts(operation['filter_text'], operation['include_blank'])
+        elif kind in ('delete_key', 'rename_key', 'rename_section'):
+            texts = [f"[{operation['section']}]"]  # Keys match case-insensitively, only the header is certain
+        else:
+            return True
+        if file_may_contain(file_path, texts):
+            return True
+    return False
+
+def content_changed(old_content, new_content):
+    """True if new_content differs from old_content.
+
+    Both texts are already in memory, so a length check followed by a plain
+    comparison is cheaper than hashing either of them.
+    """
+    return len(old_content) != len(new_content) or old_content != new_content
+
+def text_digest(content):
+    """Short, stable digest of a text, used to recognise file contents in the apply journal."""
+    return _text_hasher(content).hexdigest()
+
+def _text_hasher(content=''):
+    # Hashing the encoded pieces of a text gives the same digest as hashing the whole text
+    return hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16)
+
+def file_text_digest(file_path):
+    hasher = _text_hasher()
+    with open(file_path, 'r') as f:
+        for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), ''):
+            hasher.update(chunk.encode('utf-8', 'surrogatepass'))
+    return hasher.hexdigest()
+
+@contextmanager
+def atomic_writer(file_path):
+    """Text file opened on a temporary file next to file_path, renamed over it on success.
+
+    Readers and a crash mid-write only ever see the old or the new content. The
+    caller may set writer.discard = True to drop the temporary file instead.
+    """
+    file_path = os.path.realpath(file_path)  # Replace the target of a symlink, not the link
+    directory, name = os.path.split(file_path)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.discard = False
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if f.discard:
+            os.remove(temp_path)
+            return
+        try:
+            os.chmod(temp_path, os.stat(file_path).st_mode & 0o7777)
+        except OSError:
+            pass  # New file or foreign owner, keep mkstemp's permissions
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def write_text_atomic(file_path, content):
+    """Write text to a temporary file next to file_path, then rename it over the original."""
+    with atomic_writer(file_path) as f:
+        f.write(content)
+
+def replacement_pair(operation):
+    """(old, new) such that a replace/remove operation is exactly content.replace(old, new).
+
+    transform_replacement/transform_removal only return None when old does not
+    occur, in which case the replace is a no-op as well.
+    """
+    filter_text = operation['filter_text']
+    new = operation.get('replace_text', '') if operation['type'] == 'replace' else ''
+    if operation['include_blank']:
+        return filter_text, new
+    filter_lines = [l for l in filter_text.splitlines() if l.strip()]
+    if len(filter_lines) == 1:
+        if operation['type'] == 'replace':
+            return filter_lines[0], "\n".join(operation['replace_text'].splitlines())
+        return f"{filter_lines[0]}\n", ''
+    if operation['type'] == 'replace':
+        return filter_text, new
+    return f"{filter_text}\n", ''
+
+def stream_replace(chunks, old, new):
+    """Streaming content.replace(old, new) over text chunks, holding at most a chunk plus len(old)."""
+    pending = ''
+    for chunk in chunks:
+        pending += chunk
+        pieces = []
+        position = 0
+        while True:
+            found = pending.find(old, position)
+            if found == -1:
+                break
+            pieces.append(pending[position:found])
+            pieces.append(new)
+            position = found + len(old)
+        # Anything before the last len(old) - 1 characters can no longer start a match
+        keep = max(position, len(pending) - len(old) + 1)
+        pieces.append(pending[position:keep])
+        pending = pending[keep:]
+        yield ''.join(pieces)
+    yield pending
+
+class _LineReader:
+    """Lines out of text chunks, as iterating over a text-mode file would, with the unread rest available."""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.lines = []
+        self.pending = ''
+
+    def readline(self):
+        """Next line, or None at the end."""
+        while not self.lines:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                line, self.pending = self.pending, ''
+                return line or None
+            lines = (self.pending + chunk).split('\n')
+            self.pending = lines.pop()
+            self.lines = [f"{line}\n" for line in reversed(lines)]
+        return self.lines.pop()
+
+    def rest(self):
+        """Everything not read yet, as text chunks."""
+        yield ''.join(reversed(self.lines)) + self.pending
+        self.lines, self.pending = [], ''
+        yield from self.chunks
+
+def stream_insertion(chunks, section, config_lines, add_at_start):
+    """Streaming transform_insertion: same insertion point, with one line of look-ahead."""
+    header = f"[{section}]"
+    state = 'search'
+    previous = None
+    reader = _LineReader(chunks)
+    line = reader.readline()
+    while line is not None:
+        following = reader.readline()
+        if state == 'search':
+            if line.strip() == header:
+                state = 'comments'
         else:
-            content = content.replace(f"{filter_text}\n", '')
-            with open(file_path, 'w') as f:
-                f.write(content)
\ No newline at end of file
+            if state == 'comments' and not line.strip().startswith(';'):
+                state = 'insert' if add_at_start else 'body'
+            if state == 'body' and line.strip().startswith('['):
+                state = 'insert'
+            if state == 'insert':
+                yield from config_lines
+                yield line
+                if following is None:
+                    yield '\n'  # transform_insertion adds a newline at the end when inserting before the last line
+                else:
+                    yield following
+                    yield from reader.rest()  # Nothing left to look at, pass the remaining text through
+                return
+        yield line
+        previous = line
+        line = following
+
+    if state in ('comments', 'body'):
+        yield from config_lines  # Section runs to the end of file
+    elif state == 'search':
+        if previous is not None and not previous.endswith('\n'):
+            yield '\n'
+        yield f"{header}\n"
+        yield from config_lines
+
+def stream_plan(file_path, operations, before_write=None):
+    """Apply a plan to a file as a stream: read, transform and write a temporary file piece by piece.
+
+    Memory stays bounded by the chunk size (and the longest line for insertions)
+    whatever the file size. Both texts are hashed as they pass and the temporary
+    file only replaces the original when the digests differ. Returns True if the
+    file was modified.
+    """
+    old_hasher, new_hasher = _text_hasher(), _text_hasher()
+
+    with open(file_path, 'r') as f:
+        def read_chunks():
+            for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), ''):
+                old_hasher.update(chunk.encode('utf-8', 'surrogatepass'))
+                yield chunk
+
+        stream = read_chunks()
+        for operation in operations:
+            if operation['type'] == 'insert':
+                stream = stream_insertion(stream, operation['section'], operation['config_lines'],
+                                          operation['add_at_start'])
+            elif operation['type'] in ('replace', 'remove'):
+                old, new = replacement_pair(operation)
+                stream = stream_replace(stream, old, new)
+            else:
+                raise ValueError(f"Unknown operation type: {operation['type']}")
+
+        with atomic_writer(file_path) as writer:
+            for piece in stream:
+                if piece:
+                    new_hasher.update(piece.encode('utf-8', 'surrogatepass'))
+                    writer.write(piece)
+            old_digest, new_digest = old_hasher.hexdigest(), new_hasher.hexdigest()
+            modified = old_digest != new_digest
+            writer.discard = not modified
+            if modified and before_write:
+                before_write(file_path, old_digest, new_digest)
+    return modified
+
+def _can_stream(operations):
+    # An empty needle replaces between every character, leave that corner case to the in-memory path
+    # Key-level operations need the parsed document, they always run in memory
+    return all(operation['type'] == 'insert'
+               or (operation['type'] in ('replace', 'remove') and replacement_pair(operation)[0])
+               for operation in operations)
+
+def apply_plan(file_path, operations, before_write=None, after_write=None, streaming_threshold=None, counts=None):
+    """Apply a list of operations to a file with a single read and a single write.
+
+    Steps run in order on the in-memory text. The file is only written when the
+    resulting text differs from what was read, so untouched files keep their mtime.
+    before_write(file_path, old_digest, new_digest) is called right before the
+    file is atomically replaced (the apply journal records its intent there) and
+    after_write(file_path, old_content, new_content) once it was (the undo history
+    records it). Files larger than streaming_threshold bytes are edited with
+    stream_plan() instead, and after_write then gets None for both contents.
+    counts, if given, collects per-file statistics such as 'substitutions'.
+    Returns True if the file was modified.
+    """
+    if not _plan_may_apply(file_path, operations):
+        return False
+
+    if streaming_threshold and os.path.getsize(file_path) > streaming_threshold and _can_stream(operations):
+        modified = stream_plan(file_path, operations, before_write)
+        if modified and after_write:
+            after_write(file_path, None, None)
+        return modified
+
+    with open(file_path, 'r') as f:
+        original = f.read()
+
+    content = transform_plan(original, operations, counts)
+    if not content_changed(original, content):
+        return False
+
+    if before_write:
+        before_write(file_path, text_digest(original), text_digest(content))
+    write_text_atomic(file_path, content)
+    if after_write:
+        after_write(file_path, original, content)
+    return True
+
+def preview_plan(file_path, operations, counts=None):
+    """True if apply_plan() would modify the file; nothing is written (dry run)."""
+    if not _plan_may_apply(file_path, operations):
+        return False
+    with open(file_path, 'r') as f:
+        original = f.read()
+    return content_changed(original, transform_plan(original, operations, counts))
+
+def apply_operation(file_path, operation):
+    """Apply one operation dict to a file. Returns True if the file was modified."""
+    return apply_plan(file_path, [operation])
+
+def process_insertion(file_path, section, config_lines, add_at_start):
+    """Add config_lines to a section of a file. Returns True if the file was modified."""
+    return apply_operation(file_path, {'type': 'insert', 'section': section, 'config_lines': config_lines,
+                                       'add_at_start': add_at_start})
+
+def process_replacement(file_path, filter_text, replace_text, include_blank):
+    """Replace filter_text in a file. Returns True if the file was modified."""
+    return apply_operation(file_path, {'type': 'replace', 'filter_text': filter_text, 'replace_text': replace_text,
+                                       'include_blank': include_blank})
+
+def process_removal(file_path, filter_text, include_blank):
+    """Remove filter_text from a file. Returns True if the file was modified."""
+    return apply_operation(file_path, {'type': 'remove', 'filter_text': filter_text, 'include_blank': include_blank})
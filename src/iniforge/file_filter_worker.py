@@ -1,73 +1,97 @@
-import os
 import re
+import time
 from PySide6.QtCore import QThread, Signal
+from .filter_engine import ContentFilter, filter_paths
 
 class FileFilterWorker(QThread):
+    # Final list of all matching files
     signal = Signal(list)
+    # Matching files found since the previous batch
+    batch = Signal(list)
+    # files scanned, files total, bytes read, files matched, ETA in seconds (-1 if unknown)
+    progress = Signal(int, int, 'qint64', int, float)
 
-    def __init__(self, folder_path, file_filter_text, filter_content_text, filter_lines, regex, extensions, regex_mode=False, include_blank_lines=False):
+    BATCH_INTERVAL = 0.2  # seconds
+    BATCH_SIZE = 500
+
+    def __init__(self, files, file_filter_text, filter_content_text, filter_lines, regex, regex_mode=False, include_blank_lines=False, workers=0, use_processes=False, trigram_index=None, folder_path=None):
         super().__init__()
+        self.files = files  # Inventory entries, already matched against the configured extensions
+        self.regex = regex
+        self.trigram_index = trigram_index
         self.folder_path = folder_path
         self.file_filter_text = file_filter_text  # Filename filter
-        self.filter_content_text = filter_content_text  # Full content filter (with blank lines)
-        self.filter_lines = filter_lines
-        self.regex = regex
-        self.extensions = extensions
-        self.regex_mode = regex_mode
-        self.include_blank_lines = include_blank_lines
+        self.content_filter = ContentFilter(filter_content_text, filter_lines, regex, regex_mode, include_blank_lines)
+        self.workers = workers  # 0 means pick a default from the CPU count
+        self.use_processes = use_processes
         self._is_cancelled = False
 
     def run(self):
-        filtered_files = []
         try:
             regex = re.compile(self.file_filter_text, re.IGNORECASE)
         except re.error:
             regex = re.compile('.*')
 
-        # Compile regex pattern for content filtering if regex mode is enabled
-        content_regex = None
-        if self.regex_mode and self.regex:
-            try:
-                content_regex = re.compile(self.regex, re.IGNORECASE | re.DOTALL)
-            except re.error:
-                content_regex = None
+        candidates = [entry for entry in self.files if regex.search(entry.name)]
+        candidates, unsigned = self.prune_with_trigram_index(candidates)
+        reads_content = self.content_filter.needs_content()
+        total = len(candidates)
+        total_bytes = sum(entry.size for entry in candidates) if reads_content else 0
 
-        for root, _, files in os.walk(self.folder_path):
-            if self._is_cancelled:
-                break
-            for file in files:
-                if self._is_cancelled:
-                    break
-                if any(file.endswith(f'.{ext}') for ext in self.extensions):
-                    file_path = os.path.join(root, file)
-                    if regex.search(file):
-                        # Filter by content based on mode
-                        if self.regex_mode:
-                            # Regex mode: use ONLY regex pattern
-                            if content_regex:
-                                with open(file_path, 'r') as f:
-                                    content = f.read()
-                                    if content_regex.search(content):
-                                        filtered_files.append(file_path)
-                        else:
-                            # Non-regex mode: use ONLY content filter field
-                            if self.filter_lines or self.filter_content_text:
-                                with open(file_path, 'r') as f:
-                                    content = f.read()
-                                    
-                                    if self.include_blank_lines:
-                                        # Treat filter_content_text as a single string (keeps blank lines)
-                                        if self.filter_content_text and self.filter_content_text in content:
-                                            filtered_files.append(file_path)
-                                    else:
-                                        # Split by lines and check each line
-                                        if self.filter_lines and all(line in content for line in self.filter_lines):
-                                            filtered_files.append(file_path)
-                            else:
-                                # No filter specified, include all matching files
-                                filtered_files.append(file_path)
+        filtered_files = []
+        pending = []
+        scanned = bytes_read = 0
+        started = last_emit = time.monotonic()
+        # Signatures are built by the pool for files it reads anyway, and only kept once the scan ends
+        signatures = {}
+        signing = dict(sign_paths=set(unsigned), on_signature=signatures.__setitem__,
+                       signature_bits=self.trigram_index.max_bits) if unsigned else {}
+        # Results come back in inventory order regardless of which worker finished first
+        results = filter_paths(self.content_filter, [entry.path for entry in candidates], self.workers,
+                               self.use_processes, self.is_cancelled, **signing)
+        for entry, (file_path, matched) in zip(candidates, results):
+            scanned += 1
+            if reads_content:
+                bytes_read += entry.size
+            if matched:
+                filtered_files.append(file_path)
+                pending.append(file_path)
+            now = time.monotonic()
+            if now - last_emit >= self.BATCH_INTERVAL or len(pending) >= self.BATCH_SIZE:
+                last_emit = now
+                self._emit_batch(pending, scanned, total, bytes_read, total_bytes, len(filtered_files), now - started)
+                pending = []
 
+        self._emit_batch(pending, scanned, total, bytes_read, total_bytes, len(filtered_files), time.monotonic() - started)
+        if signatures:
+            self.trigram_index.record((entry, signatures[entry.path]) for entry in candidates if entry.path in signatures)
         self.signal.emit(filtered_files)
 
+    def prune_with_trigram_index(self, candidates):
+        """In regex mode, drop files whose trigram signature lacks a literal the regex requires.
+
+        Returns the remaining candidates and the paths of those without an up to
+        date signature: they cannot be pruned, and the scan signs them as it reads them.
+        """
+        if self.trigram_index is None or not self.content_filter.regex_mode or not self.content_filter.content_regex:
+            return candidates, []
+        self.trigram_index.load(self.folder_path, len(self.files))
+        unsigned = [entry.path for entry in candidates if not self.trigram_index.has_signature(entry)]
+        query = self.trigram_index.plan(self.regex)
+        if query is not None:
+            candidates = [entry for entry in candidates if self.trigram_index.may_match(entry, query)]
+        return candidates, unsigned
+
+    def _emit_batch(self, pending, scanned, total, bytes_read, total_bytes, matched, elapsed):
+        if pending:
+            self.batch.emit(pending)
+        # Estimate by bytes when files are read, by file count otherwise
+        done, todo = (bytes_read, total_bytes) if total_bytes else (scanned, total)
+        eta = elapsed * (todo - done) / done if done else -1.0
+        self.progress.emit(scanned, total, bytes_read, matched, eta)
+
+    def is_cancelled(self):
+        return self._is_cancelled or self.isInterruptionRequested()
+
     def cancel(self):
-        self._is_cancelled = True
\ No newline at end of file
+        self._is_cancelled = True
@@ -0,0 +1,253 @@
+import os
+import re
+import time
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from . import core
+from .trigram_index import MAX_BITS, make_signature, trigrams
+
+# Bytes the bytes regex cannot be trusted on: non-ASCII, and '\r', which decoding turns into '\n'
+BYTES_REGEX_UNSAFE = re.compile(rb'[\r\x80-\xff]')
+
+# Time a scan may spend building trigram signatures, as a fraction of the time spent reading and matching
+SIGNATURE_BUDGET = 0.5
+
+def default_workers():
+    """Same default as ThreadPoolExecutor: I/O bound, so more threads than cores."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+class MultiPatternMatcher:
+    """Checks that every one of several literal byte strings occurs in a buffer.
+
+    Built once per filter change. Duplicate needles and needles contained in a
+    longer one are dropped, since the longer needle implies them. A buffer
+    shorter than the longest needle is rejected without scanning. The remaining
+    needles are searched with the C-level bytes.find, longest (usually rarest)
+    first, stopping at the first miss. The needle that rejected the previous
+    file is tried first on the next one. Most files in a scan fail on the same
+    line, so a rejected file typically costs a single pass.
+    """
+
+    def __init__(self, needles):
+        unique = sorted(set(n for n in needles if n), key=len, reverse=True)
+        self.needles = [n for i, n in enumerate(unique) if not any(n in longer for longer in unique[:i])]
+        self.longest = len(self.needles[0]) if self.needles else 0
+
+    def find_all(self, data):
+        """True when every needle occurs in data."""
+        if len(data) < self.longest:
+            return False
+        needles = self.needles
+        for i, needle in enumerate(needles):
+            if data.find(needle) == -1:
+                if i:
+                    # Move to front, the same line is likely to reject the next file too.
+                    # Replaced rather than mutated, other worker threads may be iterating it.
+                    self.needles = [needle] + [n for n in needles if n is not needle]
+                return False
+        return True
+
+class ContentFilter:
+    """Decides whether a file matches the 'Filter by content' settings.
+
+    Files are memory-mapped and searched as raw bytes with pre-encoded needles;
+    content is only decoded when the byte search cannot decide (CRLF files with
+    multi-line needles or a regex, a non-ASCII regex or non-ASCII file content).
+    Kept free of Qt and picklable so it can run in worker threads or processes.
+    """
+
+    def __init__(self, filter_content_text, filter_lines, regex, regex_mode=False, include_blank_lines=False):
+        self.filter_content_text = filter_content_text  # Full content filter (with blank lines)
+        self.filter_lines = filter_lines
+        self.regex_mode = regex_mode
+        self.include_blank_lines = include_blank_lines
+
+        # Compile regex pattern for content filtering if regex mode is enabled
+        self.content_regex = None
+        if regex_mode and regex:
+            try:
+                self.content_regex = re.compile(regex, re.IGNORECASE | re.DOTALL)
+            except re.error:
+                self.content_regex = None
+
+        # Byte-level equivalents, None when matching has to go through decoded text.
+        # The bytes regex only agrees with the str one on ASCII content: on other bytes
+        # '.' and '[^x]' match a byte rather than a character, and '\w', '\b' and
+        # IGNORECASE only know ASCII letters.
+        self.byte_regex = None
+        if self.content_regex is not None and regex.isascii():
+            try:
+                self.byte_regex = re.compile(regex.encode('ascii'), re.IGNORECASE | re.DOTALL)
+            except re.error:
+                self.byte_regex = None
+        self.search_texts = [filter_content_text] if include_blank_lines else list(filter_lines)
+        self.needles = core.encode_needles(self.search_texts)
+        self.multiline = any('\n' in text for text in self.search_texts)
+        # Built once per filter change, shared by every file of the scan
+        self.matcher = MultiPatternMatcher(self.needles) if self.needles and len(self.needles) > 1 else None
+        # Seconds spent by scan_many(), shared by the worker threads (approximate, that is enough for a budget)
+        self.match_time = 0.0
+        self.sign_time = 0.0
+
+    def needs_content(self):
+        """False when every file passes without being opened."""
+        if self.regex_mode:
+            return True
+        return bool(self.filter_lines or self.filter_content_text)
+
+    def matches(self, file_path):
+        if self.regex_mode and not self.content_regex:
+            return False
+        if not self.needs_content():
+            # No filter specified, include all matching files
+            return True
+        with core.mapped_file(file_path) as data:
+            return self.matches_data(data)
+
+    def matches_data(self, data):
+        if self.regex_mode:
+            # Regex mode: use ONLY regex pattern
+            if not self.content_regex:
+                return False
+            if self.byte_regex is not None and BYTES_REGEX_UNSAFE.search(data) is None:
+                return self.byte_regex.search(data) is not None
+            return self.content_regex.search(core.decode_text(data)) is not None
+        # Non-regex mode: use ONLY content filter field
+        if self.needles is not None:
+            if self.matcher is not None:
+                found = self.matcher.find_all(data)
+            else:
+                found = all(data.find(needle) != -1 for needle in self.needles)
+            if found or not self.multiline or data.find(b'\r') == -1:
+                return found
+        return self.matches_text(core.decode_text(data))
+
+    def matches_text(self, content):
+        """Reference str-based check, used when the byte-level search cannot decide."""
+        if self.include_blank_lines:
+            # Treat filter_content_text as a single string (keeps blank lines)
+            return bool(self.filter_content_text) and self.filter_content_text in content
+        # Split by lines and check each line
+        return bool(self.filter_lines) and all(line in content for line in self.filter_lines)
+
+    def match_many(self, file_paths):
+        results = []
+        for file_path in file_paths:
+            try:
+                results.append(self.matches(file_path))
+            except (OSError, UnicodeDecodeError):
+                results.append(False)
+        return results
+
+    def scan_many(self, file_paths, sign, max_bits=MAX_BITS):
+        """Like match_many(), with (matched, signature) per file.
+
+        Files flagged in sign also get their trigram signature, (bits, mask), built
+        from the data already mapped for matching. Signing stays within
+        SIGNATURE_BUDGET of the matching time, so a first scan of a share is at most
+        that much slower; files left unsigned (None) are signed by later scans.
+        """
+        results = []
+        for file_path, wanted in zip(file_paths, sign):
+            signature = None
+            started = time.perf_counter()
+            try:
+                with core.mapped_file(file_path) as data:
+                    matched = self.matches_data(data)
+                    matched_at = time.perf_counter()
+                    self.match_time += matched_at - started
+                    if wanted and self.sign_time <= SIGNATURE_BUDGET * self.match_time:
+                        signature = make_signature(trigrams(data), max_bits)
+                        self.sign_time += time.perf_counter() - matched_at
+            except (OSError, UnicodeDecodeError):
+                matched = False
+            results.append((matched, signature))
+        return results
+
+# Content filter installed in each worker process by _init_process
+_process_filter = None
+
+def _init_process(content_filter):
+    global _process_filter
+    _process_filter = content_filter
+
+def _match_in_process(file_paths):
+    return _process_filter.match_many(file_paths)
+
+def _scan_in_process(file_paths, sign, max_bits):
+    return _process_filter.scan_many(file_paths, sign, max_bits)
+
+def filter_paths(content_filter, file_paths, workers=0, use_processes=False, is_cancelled=None, chunk_size=None,
+                 sign_paths=None, on_signature=None, signature_bits=MAX_BITS):
+    """Yield (file_path, matched) for every path, in input order.
+
+    Reads and matching are fanned out over a bounded thread pool, or a process pool
+    for regex-heavy scans. At most a few chunks per worker are in flight so memory
+    stays bounded, and is_cancelled() is checked between chunks.
+
+    Files in sign_paths are also given a trigram signature while they are read
+    (see ContentFilter.scan_many), reported as on_signature(file_path, (bits, mask))
+    from the consuming thread.
+    """
+    is_cancelled = is_cancelled or (lambda: False)
+    signing = bool(sign_paths) and on_signature is not None
+    sign = lambda chunk: [file_path in sign_paths for file_path in chunk]
+
+    def results(chunk, scanned):
+        if not signing:
+            yield from zip(chunk, scanned)
+            return
+        for file_path, (matched, signature) in zip(chunk, scanned):
+            if signature is not None:
+                on_signature(file_path, signature)
+            yield file_path, matched
+
+    workers = workers if workers and workers > 0 else default_workers()
+    if not content_filter.needs_content():
+        for file_path in file_paths:
+            yield file_path, True
+        return
+    if chunk_size is None:
+        chunk_size = 64 if use_processes else 8
+    if workers == 1:
+        for start in range(0, len(file_paths), chunk_size):
+            if is_cancelled():
+                return
+            chunk = file_paths[start:start + chunk_size]
+            scanned = content_filter.scan_many(chunk, sign(chunk), signature_bits) if signing else content_filter.match_many(chunk)
+            yield from results(chunk, scanned)
+        return
+
+    if use_processes:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=_init_process, initargs=(content_filter,))
+        if signing:
+            submit = lambda chunk: executor.submit(_scan_in_process, chunk, sign(chunk), signature_bits)
+        else:
+            submit = lambda chunk: executor.submit(_match_in_process, chunk)
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='iniforge-filter')
+        if signing:
+            submit = lambda chunk: executor.submit(content_filter.scan_many, chunk, sign(chunk), signature_bits)
+        else:
+            submit = lambda chunk: executor.submit(content_filter.match_many, chunk)
+
+    in_flight = deque()
+    max_in_flight = workers * 4
+    try:
+        for start in range(0, len(file_paths), chunk_size):
+            if is_cancelled():
+                return
+            chunk = file_paths[start:start + chunk_size]
+            in_flight.append((chunk, submit(chunk)))
+            if len(in_flight) >= max_in_flight:
+                chunk, future = in_flight.popleft()
+                yield from results(chunk, future.result())
+        while in_flight:
+            if is_cancelled():
+                return
+            chunk, future = in_flight.popleft()
+            yield from results(chunk, future.result())
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
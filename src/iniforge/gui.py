@@ -1,23 +1,38 @@
 import os
+import re
+import html
+import bisect
 import argparse
-import iniforge
-import pyperclip
 import platform
 from pathlib import Path
+from .startup_profile import profile
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QTextEdit,
-    QListWidget, QPushButton, QFileDialog, QLabel, QSplitter, QListWidgetItem,
-    QPlainTextEdit, QScrollArea, QMessageBox, QDialog, QCheckBox, QComboBox, QTabWidget
+    QListWidget, QListView, QPushButton, QFileDialog, QLabel, QSplitter,
+    QMessageBox, QDialog, QCheckBox, QComboBox, QTabWidget, QProgressBar,
+    QProgressDialog
 )
-from PySide6.QtCore import Qt, QSize, Signal, QSettings, QTimer, QThread, QThreadPool
-from PySide6.QtGui import (QIcon, QFont, QTextOption, QTextBlockFormat, QFontMetrics, QTextCursor, QTextDocument, QTextCharFormat)
+from PySide6.QtCore import Qt, QSize, Signal, QSettings, QTimer, QThread
+from PySide6.QtGui import (QIcon, QFont, QTextCursor, QTextDocument, QTextCharFormat)
+profile.mark("PySide6 imports")
 from .Logger import Logger
 from .widgets.QSqrdSwitchButton import QSqrdSwitchButton
-from .widgets.QAboutDialog import QAboutDialog
-from .widgets.QExtensionsDialog import QExtensionsDialog
-from .meld import Meld
+from .widgets.QFileListModel import QFileListModel
+from .widgets.QCodeEditor import QCodeEditor
+# Dialogs, Meld and the clipboard backend are imported on first use, they are not needed to show the window
 from .file_filter_worker import FileFilterWorker
+from .section_scan_worker import SectionScanWorker
+from .bulk_apply import BulkApplyExecutor
+from .bulk_apply_worker import BulkApplyWorker
+from .history import UndoHistory, RestoreExecutor
+from .bulk_table import BulkTable, TableExecutor, TableError, load_table
+from .journal import ApplyJournal
+from .inventory import WorkspaceInventory
+from .scan_cache import ScanCache
+from .trigram_index import TrigramIndex
+from .workspace_watcher import WorkspaceWatcher
 from . import core
+profile.mark("iniForge modules")
 
 # Set Windows App User Model ID for proper taskbar icon display
 if platform.system() == "Windows":
@@ -27,13 +42,7 @@ if platform.system() == "Windows":
     except Exception:
         pass
 
-os.environ['IFORGE_LOG_LEVEL'] = 'info'
-parser = argparse.ArgumentParser(description="iniForge: Bulk ini Files Manager")
-parser.add_argument('-b', '--debug', action='store_true', default=False, help='Run tool in debug mode')
-args = parser.parse_args()
-if args.debug:
-    print("####### DEBUG MODE ACTIVATED #######")
-    os.environ['IFORGE_LOG_LEVEL'] = 'debug'
+os.environ.setdefault('IFORGE_LOG_LEVEL', 'info')
 
 class GUI(QWidget):
     def __init__(self):
@@ -44,10 +53,11 @@ class GUI(QWidget):
         self.file_selected = False
         self.selected_file = None
         self.extensions = ['ini']
+        self.inventory = WorkspaceInventory()
         
-        # Check meld availability
-        self.meld_path = Meld.get_path()
-        self.meld_available = self.meld_path is not None
+        # Resolved after the window is shown, see discover_meld()
+        self.meld_path = None
+        self.meld_available = False
 
         self.setWindowTitle("iniForge: Bulk Settings Precision")
         self.setGeometry(100, 100, 1200, 600)
@@ -56,10 +66,20 @@ class GUI(QWidget):
         self.setWindowIcon(QIcon(icon_path))
 
         self.settings = QSettings(f"{self.app_path}/config.ini", QSettings.IniFormat)
-        self.thread_pool = QThreadPool()
+        self.scan_cache = ScanCache(os.path.join(self.app_path, "scan_cache.sqlite"))
+        self.trigram_index = TrigramIndex(self.scan_cache)
         self.filter_timer = QTimer()
         self.filter_timer.setSingleShot(True)
         self.filter_timer.timeout.connect(self.filter_files)
+        self.refresh_workers = []
+        self.filter_generation = 0  # Bumped by every full filter pass, older refresh results are dropped
+        self.watcher = WorkspaceWatcher(self.inventory, float(self.settings.value("Base/watch_poll_interval", 10)), self)
+        self.watcher.changed.connect(self.on_workspace_changed)
+        self.journal_path = os.path.join(self.app_path, "apply_journal.jsonl")
+        self.history = UndoHistory(int(self.settings.value("Base/undo_memory_mb", 64)) * 1024 * 1024)
+        self.history_recorder = None
+
+        profile.mark("GUI state and settings")
 
         self.main_layout = QVBoxLayout()
 
@@ -95,11 +115,11 @@ class GUI(QWidget):
         browse_button.setToolTip("Browse for folder containing the configuration files\n(Opens a folder selection dialog)")
         browse_button.clicked.connect(self.browse_folder)
         
-        meld_button = QPushButton()
-        self.set_button_icon(meld_button, 'meld.png')
-        meld_button.setToolTip("Click to open meld" if self.meld_available else "Meld is not installed")
-        meld_button.setEnabled(self.meld_available)
-        meld_button.clicked.connect(self.open_meld)
+        self.meld_button = QPushButton()
+        self.set_button_icon(self.meld_button, 'meld.png')
+        self.meld_button.setToolTip("Looking for meld...")
+        self.meld_button.setEnabled(False)
+        self.meld_button.clicked.connect(self.open_meld)
         
         about_button = QPushButton()
         self.set_button_icon(about_button, 'about.png')
@@ -122,7 +142,7 @@ class GUI(QWidget):
         top_layout.addWidget(paste_button)
         top_layout.addWidget(reload_button)
         top_layout.addWidget(browse_button)
-        top_layout.addWidget(meld_button)
+        top_layout.addWidget(self.meld_button)
         top_layout.addWidget(help_button)
         top_layout.addWidget(about_button)
 
@@ -157,14 +177,41 @@ class GUI(QWidget):
 
         self.main_layout.addWidget(main_splitter)
 
+        # Watch mode: keep the workspace in sync with external changes
+        self.watch_checkbox = QCheckBox("Watch for changes")
+        self.watch_checkbox.setChecked(str(self.settings.value("Base/watch_mode", "false")).lower() == "true")
+        self.watch_checkbox.setToolTip("Automatically pick up files added, removed or modified by other tools\n(Only the changed files are re-read)")
+        self.watch_checkbox.toggled.connect(self.set_watch_mode)
+
+        # Shown while an interrupted bulk apply is waiting to be resumed
+        self.resume_apply_button = QPushButton("Resume Interrupted Apply")
+        self.resume_apply_button.setToolTip("Continue the bulk operation that was interrupted, from the last completed file")
+        self.resume_apply_button.clicked.connect(self.check_interrupted_apply)
+        self.resume_apply_button.setVisible(False)
+
+        # Undo / redo of bulk operations (compressed per-file deltas, see history.py)
+        self.undo_button = QPushButton("Undo")
+        self.undo_button.clicked.connect(self.undo_bulk_operation)
+        self.redo_button = QPushButton("Redo")
+        self.redo_button.clicked.connect(self.redo_bulk_operation)
+        self.update_history_buttons()
+
         footer_hlayout = QHBoxLayout()
+        footer_hlayout.addWidget(self.undo_button)
+        footer_hlayout.addWidget(self.redo_button)
+        footer_hlayout.addWidget(self.resume_apply_button)
+        footer_hlayout.addWidget(self.watch_checkbox)
         footer_hlayout.addWidget(self.theme_switch)
         footer_hlayout.setAlignment(Qt.AlignRight)
         
         self.main_layout.addLayout(footer_hlayout)
         self.setLayout(self.main_layout)
+        profile.mark("GUI widgets")
 
         self.load_files()
+        profile.mark("Initial file load")
+        QTimer.singleShot(0, self.check_interrupted_apply)
+        QTimer.singleShot(0, self.discover_meld)
 
     def getExtension(self):
         ext = self.settings.value("Base/filtered_extensions", defaultValue="ini")
@@ -180,6 +227,7 @@ class GUI(QWidget):
 
     def show_extensions_dialog(self):
         """Show dialog to configure file extensions."""
+        from .widgets.QExtensionsDialog import QExtensionsDialog
         dialog = QExtensionsDialog(self, self.extensions)
         
         if dialog.exec() == QDialog.Accepted:
@@ -192,6 +240,7 @@ class GUI(QWidget):
                 self.load_files()
 
     def open_about(self):
+        from .widgets.QAboutDialog import QAboutDialog
         about_dialog = QAboutDialog(self)
         about_dialog.exec()
 
@@ -319,12 +368,28 @@ class GUI(QWidget):
         configure_extensions_button.setToolTip("Configure file extensions to filter")
         configure_extensions_button.clicked.connect(self.show_extensions_dialog)
         
+        # File list order: as found, by name, or grouped by directory
+        self.file_sort_field = QComboBox()
+        self.file_sort_field.addItem("Found order", QFileListModel.FOUND_ORDER)
+        self.file_sort_field.addItem("By name", QFileListModel.BY_NAME)
+        self.file_sort_field.addItem("By directory", QFileListModel.BY_DIRECTORY)
+        self.file_sort_field.setToolTip("Order of the file list\n(By directory groups the files of each folder and shows their relative path)")
+
         filename_filter_layout.addWidget(self.file_filter_line_edit)
+        filename_filter_layout.addWidget(self.file_sort_field)
         filename_filter_layout.addWidget(configure_extensions_button)
 
-        self.file_list_widget = QListWidget()
-        self.file_list_widget.itemDoubleClicked.connect(self.open_file_in_meld)
-        self.file_list_widget.itemClicked.connect(self.display_file_content)
+        # Model/view list: rows are painted from a compact path array, no item per file
+        self.file_list_model = QFileListModel(self)
+        self.file_list_view = QListView()
+        self.file_list_view.setUniformItemSizes(True)
+        self.file_list_view.setModel(self.file_list_model)
+        self.file_list_view.doubleClicked.connect(self.open_file_in_meld)
+        self.file_list_view.clicked.connect(self.display_file_content)
+        sort_mode = self.settings.value("Base/file_list_sort", QFileListModel.FOUND_ORDER)
+        self.file_sort_field.setCurrentIndex(max(self.file_sort_field.findData(sort_mode), 0))
+        self.file_list_model.set_sort_mode(self.file_sort_field.currentData())
+        self.file_sort_field.currentIndexChanged.connect(self.set_file_sort_mode)
 
         files_filter_footer_layout = QHBoxLayout()
         # Filtered file count label
@@ -335,11 +400,23 @@ class GUI(QWidget):
         files_copy_button.setFixedSize(24, 24)
         files_copy_button.clicked.connect(self.copy_files_list)
         files_copy_button.setToolTip("Click to copy files list to clipboard")
+        # Filtering progress, shown while a filter pass is running
+        self.filter_progress_bar = QProgressBar()
+        self.filter_progress_bar.setMaximumHeight(16)
+        self.filter_progress_bar.setVisible(False)
+        self.filter_cancel_button = QPushButton()
+        self.set_button_icon(self.filter_cancel_button, 'clear.png')
+        self.filter_cancel_button.setFixedSize(24, 24)
+        self.filter_cancel_button.setToolTip("Cancel filtering\n(Files found so far stay in the list)")
+        self.filter_cancel_button.clicked.connect(self.cancel_filtering)
+        self.filter_cancel_button.setVisible(False)
         files_filter_footer_layout.addWidget(self.filtered_file_count_label)
+        files_filter_footer_layout.addWidget(self.filter_progress_bar)
+        files_filter_footer_layout.addWidget(self.filter_cancel_button)
         files_filter_footer_layout.addWidget(files_copy_button)
 
         files_filter_layout.addLayout(filename_filter_layout)
-        files_filter_layout.addWidget(self.file_list_widget)
+        files_filter_layout.addWidget(self.file_list_view)
         files_filter_layout.addLayout(files_filter_footer_layout)
 
         files_filter_widget = QWidget()
@@ -423,6 +500,14 @@ class GUI(QWidget):
         remove_widget = self.create_remove_tab()
         tab_widget.addTab(remove_widget, "Remove Configuration")
 
+        # Tab 4: Key Operations
+        key_widget = self.create_key_tab()
+        tab_widget.addTab(key_widget, "Key Operations")
+
+        # Tab 5: Operation Queue
+        queue_widget = self.create_queue_tab()
+        tab_widget.addTab(queue_widget, "Operation Queue")
+
         # Add both text boxes to the horizontal layout
         text_boxes_layout.addWidget(filter_widget)
         text_boxes_layout.addWidget(tab_widget)
@@ -451,6 +536,7 @@ class GUI(QWidget):
         
         # Apply button
         apply_button = QPushButton("Apply Content Replacements")
+        apply_button.setToolTip("In regex mode, matches of the regex are replaced instead\n(\\1 or \\g<name> in the replacement insert the captured groups)")
         apply_button.clicked.connect(self.confirm_and_apply_replacement)
 
         # Layout for Replace Tab
@@ -461,7 +547,7 @@ class GUI(QWidget):
         replace_header_layout.setAlignment(self.replace_clear_button, Qt.AlignRight)
         replace_layout.addLayout(replace_header_layout)
         replace_layout.addWidget(self.replace_text_edit)
-        replace_layout.addWidget(apply_button)
+        replace_layout.addLayout(self.create_apply_buttons_layout(apply_button, self.build_replacement_operation))
 
         replace_widget = QWidget()
         replace_widget.setLayout(replace_layout)
@@ -507,7 +593,7 @@ class GUI(QWidget):
         config_header_layout.setAlignment(self.config_clear_button, Qt.AlignRight)
         config_layout.addLayout(config_header_layout)
         config_layout.addWidget(self.config_text_edit)
-        config_layout.addWidget(add_config_button)
+        config_layout.addLayout(self.create_apply_buttons_layout(add_config_button, self.build_insertion_operation))
 
         config_widget = QWidget()
         config_widget.setLayout(config_layout)
@@ -524,11 +610,145 @@ class GUI(QWidget):
         remove_textedit.setAlignment(Qt.AlignTop)
         
         remove_layout.addWidget(remove_textedit)
-        remove_layout.addWidget(remove_config_button)
+        remove_layout.addLayout(self.create_apply_buttons_layout(remove_config_button, self.build_removal_operation))
 
         remove_widget = QWidget()
         remove_widget.setLayout(remove_layout)
         return remove_widget
+
+    def create_key_tab(self):
+        # Structured operation on a section/key, applied on a parsed model of each file (see ini_model.py)
+        self.key_operation_field = QComboBox()
+        self.key_operation_field.addItem("Set Key", 'set_key')
+        self.key_operation_field.addItem("Delete Key", 'delete_key')
+        self.key_operation_field.addItem("Rename Key", 'rename_key')
+        self.key_operation_field.addItem("Rename Section", 'rename_section')
+        self.key_operation_field.currentIndexChanged.connect(self.update_key_fields)
+
+        # Shares the discovered sections with the Add Configuration tab, other names can be typed in
+        self.key_section_field = QComboBox()
+        self.key_section_field.setModel(self.section_field.model())
+        self.key_section_field.setEditable(True)
+        self.key_section_field.setInsertPolicy(QComboBox.NoInsert)
+
+        self.key_name_line_edit = QLineEdit()
+        self.key_name_line_edit.setPlaceholderText("Key (case-insensitive)")
+        self.key_value_label = QLabel()
+        self.key_value_line_edit = QLineEdit()
+
+        apply_key_button = QPushButton("Apply Key Operation")
+        apply_key_button.setToolTip("Edits only the targeted section/key lines, comments and spacing are kept")
+        apply_key_button.clicked.connect(self.confirm_and_apply_key_operation)
+
+        operation_layout = QHBoxLayout()
+        operation_layout.addWidget(QLabel("Operation"))
+        operation_layout.addWidget(self.key_operation_field)
+        operation_layout.addWidget(QLabel("Section"))
+        operation_layout.addWidget(self.key_section_field, 1)
+        key_layout = QHBoxLayout()
+        key_layout.addWidget(QLabel("Key"))
+        key_layout.addWidget(self.key_name_line_edit)
+        key_layout.addWidget(self.key_value_label)
+        key_layout.addWidget(self.key_value_line_edit)
+
+        key_tab_layout = QVBoxLayout()
+        key_tab_layout.addLayout(operation_layout)
+        key_tab_layout.addLayout(key_layout)
+        key_tab_layout.addStretch()
+        key_tab_layout.addLayout(self.create_apply_buttons_layout(apply_key_button, self.build_key_operation))
+
+        # Per-file values (e.g. a port per host) from an inventory sheet, in one pass
+        apply_table_button = QPushButton("Apply Table (CSV/JSON)...")
+        apply_table_button.setToolTip("Set or delete keys per file from a table with the columns file, section, key, value\n"
+                                      "(file is a glob, a relative path, a file name or a file name without extension)")
+        apply_table_button.clicked.connect(self.apply_table)
+        key_tab_layout.addWidget(apply_table_button)
+        self.update_key_fields()
+
+        key_widget = QWidget()
+        key_widget.setLayout(key_tab_layout)
+        return key_widget
+
+    def update_key_fields(self):
+        kind = self.key_operation_field.currentData()
+        self.key_name_line_edit.setEnabled(kind != 'rename_section')
+        self.key_value_line_edit.setEnabled(kind != 'delete_key')
+        self.key_value_label.setText({'set_key': "Value", 'rename_key': "New key",
+                                      'rename_section': "New section"}.get(kind, "Value"))
+
+    def create_apply_buttons_layout(self, apply_button, build_operation):
+        """Apply button of a tab, next to a button queueing the same operation instead."""
+        queue_button = QPushButton("Add to Queue")
+        queue_button.setToolTip("Queue this operation instead of applying it now\n(Queued operations are applied together, one read and write per file)")
+        queue_button.clicked.connect(lambda: self.queue_operation(build_operation()))
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(apply_button)
+        buttons_layout.addWidget(queue_button)
+        return buttons_layout
+
+    def create_queue_tab(self):
+        self.queued_operations = []
+        self.queue_list_widget = QListWidget()
+        self.queue_list_widget.setToolTip("Queued operations, applied in this order to every listed file")
+
+        remove_step_button = QPushButton("Remove Step")
+        remove_step_button.clicked.connect(self.remove_queued_operation)
+        clear_queue_button = QPushButton("Clear Queue")
+        clear_queue_button.clicked.connect(self.clear_operation_queue)
+        apply_queue_button = QPushButton("Apply Queue")
+        apply_queue_button.setToolTip("Apply all queued operations to the listed files in a single pass")
+        apply_queue_button.clicked.connect(self.confirm_and_apply_queue)
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(remove_step_button)
+        buttons_layout.addWidget(clear_queue_button)
+        buttons_layout.addWidget(apply_queue_button)
+
+        queue_layout = QVBoxLayout()
+        queue_layout.addWidget(self.queue_list_widget)
+        queue_layout.addLayout(buttons_layout)
+
+        queue_widget = QWidget()
+        queue_widget.setLayout(queue_layout)
+        return queue_widget
+
+    def queue_operation(self, operation):
+        if operation is False:
+            return  # The builder already warned
+        if operation is None:
+            QMessageBox.warning(self, "Warning", "The operation is incomplete, fill in its fields first.")
+            return
+        self.queued_operations.append(operation)
+        self.queue_list_widget.addItem(core.describe_operation(operation))
+
+    def remove_queued_operation(self):
+        row = self.queue_list_widget.currentRow()
+        if row >= 0:
+            self.queue_list_widget.takeItem(row)
+            del self.queued_operations[row]
+
+    def clear_operation_queue(self):
+        self.queue_list_widget.clear()
+        self.queued_operations = []
+
+    def confirm_and_apply_queue(self):
+        if not self.queued_operations:
+            QMessageBox.warning(self, "Warning", "The operation queue is empty.")
+            return
+        steps = "<br>".join(f"{i + 1}. {core.describe_operation(operation)}" for i, operation in enumerate(self.queued_operations))
+        message = (f"<p>Are you sure you want to apply the following operations?</p>"
+                   f"<p>{steps}</p>")
+
+        reply = QMessageBox.question(
+            self,
+            "Confirm Queued Operations",
+            message,
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+
+        if reply == QMessageBox.Yes:
+            self.start_bulk_apply("Applying queued operations", list(self.queued_operations))
     
     def create_file_viewer_mode(self):
         file_viewer_mode = QWidget()
@@ -536,45 +756,10 @@ class GUI(QWidget):
 
         self.splitter_file_viewer = QSplitter(Qt.Horizontal)
 
-        # Set monospace font for both QTextEdit widgets
-        monospace_font = QFont("Courier New", 10)
-        
-        # Set consistent line height (adjust to match font size)
-        font_metrics = QFontMetrics(monospace_font)
-        line_height = font_metrics.height()
-        block_format = QTextBlockFormat()
-        block_format.setLineHeight(line_height, QTextBlockFormat.FixedHeight)
-
-        self.line_numbers_text_edit = QPlainTextEdit()
-        self.line_numbers_text_edit.setReadOnly(True)
-        self.line_numbers_text_edit.setFixedWidth(40)
-        self.line_numbers_text_edit.setFont(monospace_font)
-        self.line_numbers_text_edit.setWordWrapMode(QTextOption.NoWrap) # Disable word wrapping to avoid line break differences
-        self.line_numbers_text_edit.document().setDocumentMargin(0) # Set consistent document margins
-        text_format = self.line_numbers_text_edit.textCursor().blockFormat() # Set the same line spacing (leading)
-        text_format.setLineHeight(100, QTextBlockFormat.FixedHeight)  # 100% of the font size
-        self.line_numbers_text_edit.textCursor().setBlockFormat(text_format)
-        self.line_numbers_text_edit.setStyleSheet("background-color: ivory;")
-
-        self.file_content_text_edit = QTextEdit()
-        self.file_content_text_edit.setFont(monospace_font)
-        self.file_content_text_edit.setWordWrapMode(QTextOption.NoWrap) # Disable word wrapping to avoid line break differences
-        self.file_content_text_edit.document().setDocumentMargin(0) # Set consistent document margins
-        self.file_content_text_edit.textCursor().setBlockFormat(text_format) # Set the same line spacing (leading)
-        # self.file_content_text_edit.setReadOnly(True)
-        
-        self.line_numbers_text_edit.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        file_content_scrollbar = self.file_content_text_edit.verticalScrollBar()
-        # Connect the scrollbar's valueChanged signal to scroll both QTextEdit widgets
-        file_content_scrollbar.valueChanged.connect(self.sync_scroll)
-        self.line_numbers_text_edit.verticalScrollBar().valueChanged.connect(lambda value: self.sync_scroll(value, numsscroll=True))
-        
-        self.set_line_height(self.line_numbers_text_edit, block_format)
-        self.set_line_height(self.file_content_text_edit, block_format)
-
-        # Set consistent document margins and padding
-        self.line_numbers_text_edit.setContentsMargins(0, 0, 0, 0)
-        self.file_content_text_edit.setContentsMargins(0, 0, 0, 0)
+        # Line numbers are painted in the editor's gutter from its visible blocks
+        self.file_content_text_edit = QCodeEditor()
+        self.file_content_text_edit.setFont(QFont("Courier New", 10))
+        self.file_content_text_edit.textChanged.connect(lambda: self.save_button.setEnabled(True))
 
         editor_menubar_layout = QHBoxLayout()
         search_label = QLabel("Editor Search")
@@ -611,6 +796,12 @@ class GUI(QWidget):
         
         self.match_info_label = QLabel("")
         self.match_info_label.setFixedWidth(80)
+
+        self.go_to_line_input = QLineEdit()
+        self.go_to_line_input.setPlaceholderText("Line")
+        self.go_to_line_input.setFixedWidth(60)
+        self.go_to_line_input.setToolTip("Go to line\n(Type a line number and press Enter)")
+        self.go_to_line_input.returnPressed.connect(self.go_to_line)
         
         
         # Initialize search match tracking
@@ -629,19 +820,11 @@ class GUI(QWidget):
         editor_menubar_layout.addWidget(self.prev_match_button)
         editor_menubar_layout.addWidget(self.next_match_button)
         editor_menubar_layout.addWidget(self.match_info_label)
+        editor_menubar_layout.addWidget(self.go_to_line_input)
         editor_menubar_layout.addWidget(self.save_button, alignment=Qt.AlignRight)
 
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        content_layout = QHBoxLayout()
-        content_layout.addWidget(self.line_numbers_text_edit)
-        content_layout.addWidget(self.file_content_text_edit)
-
-        content_widget = QWidget()
-        content_widget.setLayout(content_layout)
-        scroll_area.setWidget(content_widget)
-
-        self.splitter_file_viewer.addWidget(scroll_area)
+        self.splitter_file_viewer.addWidget(self.file_content_text_edit)
+        self.large_file_viewer = None  # Created for the first file above the large file threshold
 
         file_viewer_layout.addLayout(editor_menubar_layout)
         file_viewer_layout.addWidget(self.splitter_file_viewer)
@@ -653,10 +836,35 @@ class GUI(QWidget):
         query = self.search_input.text()
         case_sensitive = self.case_sensitive_button.isChecked()
 
+        if query and self.large_file_mode():
+            self.find_in_large_file()
+            return
         # Implement search and highlight
         if query:
             self.highlight_search_results(query, case_sensitive)
 
+    def large_file_mode(self):
+        return self.large_file_viewer is not None and self.large_file_viewer.isVisible()
+
+    def find_in_large_file(self, backwards=False):
+        """Large files are searched one match at a time, on the raw mapped bytes."""
+        found = self.large_file_viewer.find(self.search_input.text(), self.case_sensitive_button.isChecked(), backwards)
+        self.match_info_label.setText("" if found else "No matches")
+        self.enable_navigation_buttons(found)
+
+    def go_to_line(self):
+        text = self.go_to_line_input.text().strip()
+        if not text.isdigit():
+            return
+        line_number = int(text)
+        if self.large_file_mode():
+            self.large_file_viewer.go_to_line(line_number)
+            return
+        block = self.file_content_text_edit.document().findBlockByNumber(line_number - 1)
+        if block.isValid():
+            self.file_content_text_edit.setTextCursor(QTextCursor(block))
+            self.file_content_text_edit.ensureCursorVisible()
+
     def highlight_search_results(self, query, case_sensitive):
         # Clear previous highlights first
         self.clear_highlights()
@@ -762,6 +970,9 @@ class GUI(QWidget):
         self.next_match_button.setEnabled(enabled)
     
     def go_to_previous_match(self):
+        if self.large_file_mode():
+            self.find_in_large_file(backwards=True)
+            return
         if not self.search_matches:
             return
             
@@ -769,6 +980,9 @@ class GUI(QWidget):
         self.navigate_to_current_match()
     
     def go_to_next_match(self):
+        if self.large_file_mode():
+            self.find_in_large_file()
+            return
         if not self.search_matches:
             return
             
@@ -794,23 +1008,6 @@ class GUI(QWidget):
         # Adjust button's position to the top-right of the textedit widget
         self.save_button.move(self.file_content_text_edit.width() - self.save_button.width() - 6, 6)
     
-    def sync_scroll(self, value, numsscroll=False):
-        # Calculate the scroll ratio of the right QTextEdit
-        max_scroll_right = self.file_content_text_edit.verticalScrollBar().maximum()
-        max_scroll_left = self.line_numbers_text_edit.verticalScrollBar().maximum()
-
-        if numsscroll and max_scroll_left > 0:
-            # Calculate the corresponding value for the right QTextEdit
-            scroll_ratio = value / max_scroll_left
-            right_value = round(scroll_ratio * max_scroll_right)
-            self.file_content_text_edit.verticalScrollBar().setValue(right_value)
-
-        elif max_scroll_right > 0:
-            # Calculate the corresponding value for the left QTextEdit
-            scroll_ratio = value / max_scroll_right
-            left_value = round(scroll_ratio * max_scroll_left)
-            self.line_numbers_text_edit.verticalScrollBar().setValue(left_value)
-
     def save_changes(self):
         prs_content = self.file_content_text_edit.toPlainText()
         if self.selected_file:
@@ -818,33 +1015,43 @@ class GUI(QWidget):
                 file.write(prs_content)
                 self.save_button.setEnabled(False)
         
-    def set_line_height(self, text_edit, block_format):
-        cursor = text_edit.textCursor()
-        cursor.select(QTextCursor.Document)
-        cursor.mergeBlockFormat(block_format)
-        cursor.clearSelection()
-        text_edit.setTextCursor(cursor)
-        
-    def display_file_content(self, item):
+    def display_file_content(self, index):
         self.file_selected = True
-        self.selected_file = item.data(Qt.UserRole)
+        self.selected_file = index.data(Qt.UserRole)
+        self.clear_highlights()
+        threshold = int(self.settings.value("Base/large_file_threshold_mb", 8)) * 1024 * 1024
+        if os.path.getsize(self.selected_file) > threshold:
+            self.show_large_file(self.selected_file)
+            return
+        self.show_editor()
+
         with open(self.selected_file, 'r') as file:
             content = file.read()
 
-        lines = content.splitlines()
-        line_numbers = "\n".join(str(i + 1).zfill(4) for i in range(len(lines)+1))  # Start from 1, with leading zeros
-        formatted_lines = "\n".join(self.format_line(line) for line in lines)
-        
-        self.line_numbers_text_edit.setPlainText(line_numbers)
-        self.file_content_text_edit.setPlainText(formatted_lines)
-
-        # Ensure both editors are scrolled to the top when content is loaded
+        self.file_content_text_edit.setPlainText("\n".join(content.splitlines()))
+        # Ensure the editor is scrolled to the top when content is loaded
         self.file_content_text_edit.verticalScrollBar().setValue(0)
-        self.line_numbers_text_edit.verticalScrollBar().setValue(0)
+        self.save_button.setEnabled(False)
 
-        # Enable save button on editor content change
-        self.file_content_text_edit.textChanged.connect(lambda: self.save_button.setEnabled(True))
+    def show_large_file(self, file_path):
+        """Read-only, paged view: the file is memory-mapped and only the visible lines are decoded."""
+        if self.large_file_viewer is None:
+            from .widgets.QLargeFileViewer import QLargeFileViewer
+            self.large_file_viewer = QLargeFileViewer()
+            self.splitter_file_viewer.addWidget(self.large_file_viewer)
+        self.file_content_text_edit.setVisible(False)
+        self.large_file_viewer.setVisible(True)
         self.save_button.setEnabled(False)
+        try:
+            self.large_file_viewer.open_file(file_path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Error", f"Cannot open {file_path}: {e}")
+
+    def show_editor(self):
+        if self.large_file_viewer is not None:
+            self.large_file_viewer.close_file()
+            self.large_file_viewer.setVisible(False)
+        self.file_content_text_edit.setVisible(True)
 
     def reload_files(self, folder_path):
         self.save_button.setEnabled(False)
@@ -862,119 +1069,210 @@ class GUI(QWidget):
         folder_path = QFileDialog.getExistingDirectory(self, "Select Working Directory")
         self.reload_files(folder_path)
 
+    def discover_meld(self):
+        """Look meld up once the window is up, instead of delaying the first paint."""
+        from .meld import Meld
+        self.meld_path = Meld.get_path()
+        self.meld_available = self.meld_path is not None
+        self.meld_button.setToolTip("Click to open meld" if self.meld_available else "Meld is not installed")
+        self.meld_button.setEnabled(self.meld_available)
+
     def open_meld(self):
         folder_path = self.working_dir_line_edit.text()
         if os.path.isdir(folder_path) and self.meld_available:
+            from .meld import Meld
             self.meld_thread = Meld(self.meld_path, folder_path)
             self.meld_thread.start()
 
     def toggle_theme(self, state):
         text_editors = [self.file_content_text_edit, self.working_dir_line_edit, 
-                        self.file_list_widget, self.filter_text_edit, self.replace_text_edit]
+                        self.file_list_view, self.filter_text_edit, self.replace_text_edit]
         if state: # dark theme
             self.setStyleSheet("QWidget { background-color: #2e2e2e; color: #ffffff; }")
-            self.line_numbers_text_edit.setStyleSheet("background-color: dimgray;")
+            self.file_content_text_edit.set_gutter_colors("dimgray", "white")
             for txtedit in text_editors: 
                 txtedit.setStyleSheet("background-color: slategray;")
             return
         self.setStyleSheet("")  # Reset to default (bright theme)
-        self.line_numbers_text_edit.setStyleSheet("background-color: ivory;")
+        self.file_content_text_edit.set_gutter_colors("ivory", Qt.darkGray)
         for txtedit in text_editors: 
             txtedit.setStyleSheet("")
 
     def copy_files_list(self):
-        list_of_files = ""
-        files_list = [self.file_list_widget.item(i).text() for i in range(self.file_list_widget.count())]
-        for filename in files_list:
-            list_of_files += f"{filename}\n"
+        model = self.file_list_model
+        list_of_files = "".join(f"{model.display_text(row)}\n" for row in range(len(model)))
         if list_of_files:
+            import pyperclip  # Picks its clipboard backend on import, only needed here
             pyperclip.copy(list_of_files)
     
     def load_files(self):
         folder_path = self.working_dir_line_edit.text()
-        self.file_list_widget.clear()
+        self.file_list_model.set_root(folder_path)
         if os.path.isdir(folder_path):
             self.log.info(f"Reading folder content: {folder_path}")
             try:
-                for root, _, files in os.walk(folder_path):
-                    for file in files:
-                        if any(file.lower().endswith(f'.{ext}') for ext in self.extensions):
-                            file_path = os.path.join(root, file)
-                            self.add_file_to_list_widget(file_path)
+                # The list itself is filled by filter_files(), streamed from the filter worker
+                self.inventory.scan(folder_path, self.extensions)
 
             except Exception as e:
                 print(f"Error loading files: {e}")
+        else:
+            self.inventory.scan(folder_path, self.extensions)  # Leaves the inventory empty
         self.filter_files()
         self.update_sections()
+        if self.watch_checkbox.isChecked():
+            self.watcher.start()
         
     def update_sections(self):
-        self.section_field.clear()
-        self.section_field.addItems(self.getConfigSections())
+        """Rediscover sections in the background, the combobox stays usable with the sections found so far."""
+        if hasattr(self, 'section_worker') and self.section_worker.isRunning():
+            self.section_worker.requestInterruption()
+            self.section_worker.wait()
+        self.section_worker = SectionScanWorker(self.inventory, self.scan_cache)
+        self.section_worker.batch.connect(self.merge_sections)
+        self.section_worker.signal.connect(self.finish_sections)
+        self.section_worker.start()
+
+    def merge_sections(self, sections):
+        """Insert newly found section names into the (sorted) section combobox."""
+        if self.sender() is not self.section_worker:
+            return
+        existing = [self.section_field.itemText(i) for i in range(self.section_field.count())]
+        for section in sections:
+            index = bisect.bisect_left(existing, section)
+            if index < len(existing) and existing[index] == section:
+                continue
+            existing.insert(index, section)
+            self.section_field.insertItem(index, section)
+
+    def finish_sections(self, sections):
+        """Drop section names no file contains any more."""
+        if self.sender() is not self.section_worker:
+            return
+        keep = set(sections)
+        for index in reversed(range(self.section_field.count())):
+            if self.section_field.itemText(index) not in keep:
+                self.section_field.removeItem(index)
+
+    def set_watch_mode(self, enabled):
+        self.settings.setValue("Base/watch_mode", "true" if enabled else "false")
+        if enabled:
+            self.watcher.start()
+        else:
+            self.watcher.stop()
+
+    def on_workspace_changed(self, added, removed, modified):
+        """Apply file system changes reported by the watcher without rescanning the whole tree."""
+        self.log.debug(f"Workspace changed: {len(added)} added, {len(removed)} removed, {len(modified)} modified")
+        if removed:
+            self.merge_file_list(removed, [])
+        if hasattr(self, 'worker') and self.worker.isRunning():
+            # A full filter pass is in flight and may have read stale content, run it again
+            self.start_filter_timer()
+        else:
+            entries = [self.inventory.get(path) for path in added + modified]
+            self.refilter_entries([entry for entry in entries if entry is not None])
+        self.update_sections()
+
+    def refilter_entries(self, entries):
+        """Run the current filter over the given inventory entries only and merge the result into the list."""
+        if not entries:
+            return
+        candidates = [entry.path for entry in entries]
+        generation = self.filter_generation
+        worker = self.create_filter_worker(entries)
+        worker.signal.connect(lambda matched: self.merge_refreshed(generation, candidates, matched))
+        worker.finished.connect(lambda: self.refresh_workers.remove(worker))
+        self.refresh_workers.append(worker)
+        worker.start()
+
+    def merge_refreshed(self, generation, candidates, matched):
+        if generation != self.filter_generation:
+            return  # Ran with a filter a newer full pass replaced, or cancelled by it
+        self.merge_file_list(candidates, matched)
+
+    def merge_file_list(self, candidates, matched):
+        """Update list entries for the candidate paths: keep/add the matched ones, drop the rest."""
+        matched = set(matched)
+        self.file_list_model.remove_paths(set(candidates) - matched)
+        # Inventory order; paths already listed are skipped by the model
+        self.file_list_model.append_paths([file_path for file_path in self.inventory.paths() if file_path in matched])
+        self.filtered_file_count_label.setText(f"Filtered files: {len(self.file_list_model)}")
     
     def start_filter_timer(self):
         if self.filter_timer.isActive():
             self.filter_timer.stop()
         self.filter_timer.start(1000)
 
-    def show_filtering_popup(self):
-        self.filter_dialog = QDialog(self)
-        self.filter_dialog.setWindowTitle("Initializing")
-        self.filter_dialog.setModal(True)
-        
-        layout = QVBoxLayout()
-        self.filter_dialog.setLayout(layout)
-
-        self.filter_progress_label = QLabel("Processing configuration files, please wait...")
-        layout.addWidget(self.filter_progress_label)
-        
-        cancel_button = QPushButton("Cancel")
-        cancel_button.clicked.connect(self.cancel_filtering)
-        layout.addWidget(cancel_button)
-
-        self.filter_dialog.show()
-        QApplication.processEvents()
+    def show_filtering_progress(self, visible):
+        self.filter_progress_bar.setVisible(visible)
+        self.filter_cancel_button.setVisible(visible)
+        if visible:
+            self.filter_progress_bar.setRange(0, 0)  # Busy indicator until the first progress report
 
     def cancel_filtering(self):
         if hasattr(self, 'worker') and self.worker.isRunning():
             self.worker.cancel()
-        self.filter_dialog.close()
+        self.show_filtering_progress(False)
 
     def filter_files(self):
         self.filter_timer.stop()
-        file_filter_text = self.file_filter_line_edit.text()
-        filter_content_text = self.filter_text_edit.toPlainText()  # Full content with blank lines
-        include_blank = self.include_blank_lines_checkbox.isChecked()
-        filter_lines = filter_content_text.splitlines() if filter_content_text else []
-        regex_mode = self.regex_toggle_button.isChecked()
-        regexpr = self.regex_expression.text() if regex_mode else None
-        folder_path = self.working_dir_line_edit.text()
 
         if hasattr(self, 'worker') and self.worker.isRunning():
             self.worker.requestInterruption()
             self.worker.wait()
+        # Refreshes started by watch events ran with the previous filter, this pass covers their files
+        self.filter_generation += 1
+        for worker in self.refresh_workers:
+            worker.cancel()
 
-        self.show_filtering_popup()
-
-        self.worker = FileFilterWorker(folder_path, file_filter_text, filter_content_text, filter_lines, regexpr, self.extensions, regex_mode, include_blank)
-        self.worker.signal.connect(self.update_file_list)
+        self.save_button.setEnabled(False)
+        self.file_list_model.clear()
+        self.filtered_file_count_label.setText("Filtered files: 0")
+        self.show_filtering_progress(True)
+
+        self.worker = self.create_filter_worker(self.inventory.entries())
+        self.worker.batch.connect(self.update_file_list)
+        self.worker.progress.connect(self.update_filter_progress)
+        self.worker.signal.connect(self.finish_filtering)
         self.worker.start()
+
+    def create_filter_worker(self, entries):
+        file_filter_text = self.file_filter_line_edit.text()
+        filter_content_text = self.filter_text_edit.toPlainText()  # Full content with blank lines
+        include_blank = self.include_blank_lines_checkbox.isChecked()
+        filter_lines = filter_content_text.splitlines() if filter_content_text else []
+        regex_mode = self.regex_toggle_button.isChecked()
+        regexpr = self.regex_expression.text() if regex_mode else None
+        workers = int(self.settings.value("Base/filter_workers", 0))
+        use_processes = str(self.settings.value("Base/filter_use_processes", "false")).lower() == "true"
+        return FileFilterWorker(entries, file_filter_text, filter_content_text, filter_lines, regexpr, regex_mode, include_blank,
+                                workers, use_processes, self.trigram_index, self.inventory.folder_path)
         
-    def getConfigSections(self):
-        folder = self.working_dir_line_edit.text()
-        return core.get_config_sections(folder, self.extensions)
-    
     def update_file_list(self, filtered_files):
-        self.save_button.setEnabled(False)
-        self.file_list_widget.clear()
-        for file_path in filtered_files:
-            item = QListWidgetItem(os.path.basename(file_path))
-            item.setData(Qt.UserRole, file_path)
-            self.file_list_widget.addItem(item)
+        """Append a batch of matches streamed by the running filter worker."""
+        if self.sender() is not self.worker:
+            return  # Late batch from a superseded filter pass
+        self.file_list_model.append_paths(filtered_files)  # Skips paths a refresh already listed
 
+    def update_filter_progress(self, scanned, total, bytes_read, matched, eta):
+        if self.sender() is not self.worker:
+            return
+        self.filtered_file_count_label.setText(f"Filtered files: {matched}")
+        self.filter_progress_bar.setRange(0, max(total, 1))
+        self.filter_progress_bar.setValue(scanned)
+        eta_text = f"ETA {eta:.0f}s" if eta >= 0 else "ETA --"
+        self.filter_progress_bar.setFormat(f"%v/%m  {eta_text}")
+        self.filter_progress_bar.setToolTip(f"Scanned {scanned} of {total} files\n"
+                                            f"Read {bytes_read / (1024 * 1024):.1f} MB\n"
+                                            f"Matched {matched} files")
+
+    def finish_filtering(self, filtered_files):
+        if self.sender() is not self.worker:
+            return
         # Update filtered file count label
         self.filtered_file_count_label.setText(f"Filtered files: {len(filtered_files)}")
-
-        self.filter_dialog.close()  # Close the popup after filtering is complete
+        self.show_filtering_progress(False)
 
     def confirm_and_remove_configuration(self):
         filter_text = self.filter_text_edit.toPlainText()
@@ -1016,6 +1314,9 @@ class GUI(QWidget):
             self.apply_insertion()
 
     def confirm_and_apply_replacement(self):
+        if self.regex_toggle_button.isChecked():
+            self.confirm_and_apply_regex_replacement()
+            return
         filter_text = self.filter_text_edit.toPlainText()
         replace_text = self.replace_text_edit.toPlainText()
 
@@ -1038,73 +1339,345 @@ class GUI(QWidget):
         if reply == QMessageBox.Yes:
             self.apply_replacement()
 
-    def apply_insertion(self):
+    def confirm_and_apply_key_operation(self):
+        operation = self.build_key_operation()
+        if operation is None:
+            QMessageBox.warning(self, "Warning", "Fill in the section, the key and the new name where the operation needs them.")
+            return
+
+        message = (f"<p>Are you sure you want to apply the following operation?</p>"
+                   f"<p><b>{core.describe_operation(operation)}</b></p>")
+
+        reply = QMessageBox.question(
+            self,
+            "Confirm Key Operation",
+            message,
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+
+        if reply == QMessageBox.Yes:
+            self.start_bulk_apply("Applying key operation", [operation])
+
+    def build_key_operation(self):
+        kind = self.key_operation_field.currentData()
+        section = self.key_section_field.currentText().strip()
+        key = self.key_name_line_edit.text().strip()
+        value = self.key_value_line_edit.text().strip()
+
+        if not section or (kind != 'rename_section' and not key):
+            return None
+        if kind == 'set_key':
+            return {'type': 'set_key', 'section': section, 'key': key, 'value': value}
+        if kind == 'delete_key':
+            return {'type': 'delete_key', 'section': section, 'key': key}
+        if not value:
+            return None
+        if kind == 'rename_key':
+            return {'type': 'rename_key', 'section': section, 'key': key, 'new_key': value}
+        return {'type': 'rename_section', 'section': section, 'new_section': value}
+
+    def confirm_and_apply_regex_replacement(self):
+        operation = self.build_regex_replacement_operation()
+        if not operation:
+            return
+
+        message = (f"<p>Are you sure you want to replace every match of the regex?</p>"
+                   f"<p><b>Regex:</b><br><pre>{html.escape(operation['pattern'])}</pre></p>"
+                   f"<p><b>Replace with:</b><br><pre>{html.escape(operation['replacement'])}</pre></p>")
+
+        reply = QMessageBox.question(
+            self,
+            "Confirm Regex Replacement",
+            message,
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+
+        if reply == QMessageBox.Yes:
+            self.start_bulk_apply("Replacing regex matches", [operation])
+
+    def build_regex_replacement_operation(self):
+        """Regex mode: the filter regex is substituted with the replace text (\\1, \\g<name> backreferences).
+
+        Returns False, rather than None, when a warning explaining why was already shown.
+        """
+        pattern = self.regex_expression.text()
+        replacement = self.replace_text_edit.toPlainText()
+        if not pattern:
+            QMessageBox.warning(self, "Warning", "Enter the regex to replace in the regex field.")
+            return False
+        try:
+            core.compile_replacement_regex(pattern, True)
+        except re.error as e:
+            QMessageBox.warning(self, "Invalid Regex", f"Invalid regex: {e}")
+            return False
+        try:
+            core.check_regex_replacement(pattern, replacement, True)
+        except re.error as e:
+            QMessageBox.warning(self, "Invalid Replacement", f"Invalid replacement text: {e}\n\n"
+                                "Backslashes start escapes and backreferences, write '\\\\' for a literal one.")
+            return False
+        # Case-insensitive like the content filter, but per line (no DOTALL) so '.*' stops at the end of line
+        return {'type': 'regex_replace', 'pattern': pattern, 'replacement': replacement, 'ignore_case': True}
+
+    def build_insertion_operation(self):
         section = self.section_field.currentText()
         configuration = self.config_text_edit.toPlainText()
         config_lines = configuration.splitlines()
         config_lines = [l for l in config_lines if l.strip()]
 
         if not config_lines or not section:
-            return
+            return None
         
         # Add newline to each line if not present
         config_lines = [f"{line}\n" if not line.endswith("\n") else line for line in config_lines]
         add_at_start = self.add_at_start_checkbox.isChecked()
-        
-        for index in range(self.file_list_widget.count()):
-            item = self.file_list_widget.item(index)
-            file_path = item.data(Qt.UserRole)
-            core.process_insertion(file_path, section, config_lines, add_at_start)
+        return {'type': 'insert', 'section': section, 'config_lines': config_lines, 'add_at_start': add_at_start}
 
-    def apply_replacement(self):
+    def build_replacement_operation(self):
+        if self.regex_toggle_button.isChecked():
+            return self.build_regex_replacement_operation()
         filter_text = self.filter_text_edit.toPlainText()
         replace_text = self.replace_text_edit.toPlainText()
         include_blank = self.include_blank_lines_checkbox.isChecked()
 
         if not filter_text:
-            return
+            return None
+        return {'type': 'replace', 'filter_text': filter_text, 'replace_text': replace_text, 'include_blank': include_blank}
 
-        for index in range(self.file_list_widget.count()):
-            item = self.file_list_widget.item(index)
-            file_path = item.data(Qt.UserRole)
-            core.process_replacement(file_path, filter_text, replace_text, include_blank)
-
-    def apply_removal(self):
+    def build_removal_operation(self):
         filter_text = self.filter_text_edit.toPlainText()
         include_blank = self.include_blank_lines_checkbox.isChecked()
         
         if not filter_text:
+            return None
+        return {'type': 'remove', 'filter_text': filter_text, 'include_blank': include_blank}
+
+    def apply_insertion(self):
+        operation = self.build_insertion_operation()
+        if operation:
+            self.start_bulk_apply("Adding configuration", [operation])
+
+    def apply_replacement(self):
+        operation = self.build_replacement_operation()
+        if operation:
+            self.start_bulk_apply("Replacing content", [operation])
+
+    def apply_removal(self):
+        operation = self.build_removal_operation()
+        if operation:
+            self.start_bulk_apply("Removing configuration", [operation])
+
+    def listed_file_paths(self):
+        return self.file_list_model.paths()
+
+    def start_bulk_apply(self, title, operations, journal=None, plans=None):
+        """Run a plan (list of operations) over the listed files on a worker pool, with progress and cancellation.
+
+        A table-driven run passes plans ({file: operations}) instead and covers
+        exactly those files. Progress is journaled so a run interrupted by a crash
+        can be resumed; a resumed run passes its reopened journal and only
+        processes the files left.
+        """
+        if hasattr(self, 'apply_worker') and self.apply_worker.isRunning():
+            QMessageBox.warning(self, "Operation Running", "Another bulk operation is still running.")
+            return
+        if journal is None:
+            file_paths = list(plans) if plans is not None else self.listed_file_paths()
+            if not file_paths:
+                return
+            try:
+                journal = ApplyJournal.create(self.journal_path, operations, file_paths, plans)
+            except OSError as e:
+                self.log.error(f"Cannot write apply journal {self.journal_path}: {e}")
+                journal = None
+        else:
+            file_paths = journal.resume()
+            plans = journal.plans
+        self.resume_apply_button.setVisible(False)
+
+        workers = int(self.settings.value("Base/apply_workers", 0))
+        self.history_recorder = self.history.recorder(self.describe_plan(operations, plans))
+        streaming_threshold = float(self.settings.value("Base/streaming_threshold_mb", 64)) * 1024 * 1024
+        if plans is not None:
+            executor = TableExecutor(plans, workers, journal, self.history_recorder, streaming_threshold)
+        else:
+            executor = BulkApplyExecutor(operations, workers, journal, self.history_recorder, streaming_threshold)
+        self.run_bulk_executor(title, executor, file_paths)
+
+    def describe_plan(self, operations, plans=None, separator="; "):
+        if plans is not None:
+            return f"Table edit: {sum(len(plan) for plan in plans.values())} operations on {len(plans)} files"
+        return separator.join(core.describe_operation(operation) for operation in operations)
+
+    def apply_table(self):
+        """Apply a CSV/JSON table of file -> section/key/value rows, each file getting its own plan."""
+        if not self.inventory.folder_path:
+            return
+        table_path, _ = QFileDialog.getOpenFileName(self, "Select Edit Table", self.inventory.folder_path,
+                                                    "Edit tables (*.csv *.json);;All files (*)")
+        if not table_path:
+            return
+        try:
+            table = BulkTable(load_table(table_path))
+        except TableError as e:
+            QMessageBox.warning(self, "Invalid Table", f"Cannot use {os.path.basename(table_path)}: {e}")
+            return
+
+        plans, unmatched = table.plans(self.inventory.folder_path, self.inventory.paths())
+        if not plans:
+            QMessageBox.warning(self, "Warning", "No row of the table matches a file of the workspace.")
+            return
+        message = (f"<p>Are you sure you want to apply {len(table.rows)} table rows?</p>"
+                   f"<p>{sum(len(plan) for plan in plans.values())} key operations on {len(plans)} files.</p>")
+        if unmatched:
+            rows = "<br>".join(html.escape(f"{row['file']}: [{row['section']}] {row['key']}") for row in unmatched[:20])
+            message += f"<p><b>{len(unmatched)} rows match no file:</b><br>{rows}</p>"
+
+        reply = QMessageBox.question(
+            self,
+            "Confirm Table Edit",
+            message,
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+
+        if reply == QMessageBox.Yes:
+            self.start_bulk_apply("Applying edit table", None, plans=plans)
+
+    def run_bulk_executor(self, title, executor, file_paths):
+        """Run a bulk executor on a worker thread behind a cancellable progress dialog."""
+        if self.large_file_mode():
+            self.show_editor()  # Drops the file mapping, that would keep the file from being replaced on Windows
+        self.apply_progress_dialog = QProgressDialog(f"{title}...", "Cancel", 0, len(file_paths), self)
+        self.apply_progress_dialog.setWindowTitle(title)
+        self.apply_progress_dialog.setWindowModality(Qt.WindowModal)
+        self.apply_progress_dialog.setMinimumDuration(0)
+        self.apply_progress_dialog.setAutoClose(False)
+        self.apply_progress_dialog.setAutoReset(False)
+
+        self.apply_worker = BulkApplyWorker(executor, file_paths)
+        self.apply_worker.progress.connect(self.update_apply_progress)
+        self.apply_worker.signal.connect(self.finish_bulk_apply)
+        self.apply_progress_dialog.canceled.connect(self.apply_worker.cancel)
+        self.apply_worker.start()
+
+    def check_interrupted_apply(self):
+        """Offer to resume a bulk apply whose journal was left behind by a crash."""
+        journal = ApplyJournal.load(self.journal_path, core.file_text_digest)
+        if journal is None:
+            self.resume_apply_button.setVisible(False)
             return
+        done = len(journal.file_paths) - len(journal.remaining())
+        steps = self.describe_plan(journal.operations, journal.plans, "<br>")
+        message_box = QMessageBox(self)
+        message_box.setWindowTitle("Resume Interrupted Operation")
+        message_box.setIcon(QMessageBox.Question)
+        message_box.setText(f"<p>A bulk operation was interrupted after {done} of {len(journal.file_paths)} files:</p>"
+                            f"<p>{steps}</p><p>Resume it with the remaining files?</p>")
+        resume_button = message_box.addButton("Resume", QMessageBox.AcceptRole)
+        discard_button = message_box.addButton("Discard", QMessageBox.DestructiveRole)
+        message_box.addButton("Later", QMessageBox.RejectRole)
+        message_box.exec()
+
+        clicked = message_box.clickedButton()
+        if clicked is resume_button:
+            self.start_bulk_apply("Resuming bulk operation", journal.operations, journal)
+        elif clicked is discard_button:
+            ApplyJournal.discard(self.journal_path)
+            self.resume_apply_button.setVisible(False)
+        else:
+            self.resume_apply_button.setVisible(True)
+
+    def update_apply_progress(self, done, total, file_path, rate):
+        self.apply_progress_dialog.setValue(done)
+        self.apply_progress_dialog.setLabelText(f"{done}/{total} files ({rate:.0f} files/s)\n{os.path.basename(file_path)}")
 
-        for index in range(self.file_list_widget.count()):
-            item = self.file_list_widget.item(index)
-            file_path = item.data(Qt.UserRole)
-            core.process_removal(file_path, filter_text, include_blank)
+    def undo_bulk_operation(self):
+        self.restore_history_step(undo=True)
 
-    def open_file_in_meld(self, item):
+    def redo_bulk_operation(self):
+        self.restore_history_step(undo=False)
+
+    def restore_history_step(self, undo):
+        """Roll the last bulk operation back (or forward again), rewriting only the files it changed."""
+        if hasattr(self, 'apply_worker') and self.apply_worker.isRunning():
+            QMessageBox.warning(self, "Operation Running", "Another bulk operation is still running.")
+            return
+        if not (self.history.can_undo() if undo else self.history.can_redo()):
+            return
+        step = self.history.undo_step() if undo else self.history.redo_step()
+        self.history_recorder = None
+        workers = int(self.settings.value("Base/apply_workers", 0))
+        title = "Undoing bulk operation" if undo else "Redoing bulk operation"
+        self.run_bulk_executor(title, RestoreExecutor(step, undo, workers), step.paths())
+
+    def update_history_buttons(self):
+        self.undo_button.setEnabled(self.history.can_undo())
+        self.redo_button.setEnabled(self.history.can_redo())
+        self.undo_button.setToolTip(f"Undo: {self.history.undo_stack[-1].description}" if self.history.can_undo()
+                                    else "Nothing to undo")
+        self.redo_button.setToolTip(f"Redo: {self.history.redo_stack[-1].description}" if self.history.can_redo()
+                                    else "Nothing to redo")
+
+    def finish_bulk_apply(self, result):
+        self.apply_progress_dialog.close()
+        if self.history_recorder is not None:
+            if not self.history_recorder.finish():
+                self.log.warning("The operation changed too much to fit in the undo history (Base/undo_memory_mb)")
+            for file_path in self.history_recorder.step.unrecorded:
+                self.log.warning(f"{file_path} was edited as a stream (Base/streaming_threshold_mb), its changes cannot be undone")
+            self.history_recorder = None
+        self.update_history_buttons()
+        self.log.info(result.summary())
+        for file_path, error in result.failed:
+            self.log.error(f"Failed to update {file_path}: {error}")
+
+        message = (f"<p><b>Modified:</b> {len(result.changed)}<br>"
+                   f"<b>Unchanged:</b> {len(result.unchanged)}<br>"
+                   f"<b>Failed:</b> {len(result.failed)}</p>"
+                   f"<p>{result.processed} of {result.total} files processed in {result.elapsed:.1f}s"
+                   f"{' (cancelled)' if result.cancelled else ''}</p>")
+        if result.substitutions:
+            for file_path, substitutions in result.substitutions.items():
+                self.log.info(f"{file_path}: {substitutions} substitutions")
+            top = sorted(result.substitutions.items(), key=lambda item: item[1], reverse=True)[:20]
+            counts = "<br>".join(f"{os.path.basename(path)}: {substitutions}" for path, substitutions in top)
+            message += (f"<p><b>Substitutions:</b> {sum(result.substitutions.values())} in "
+                        f"{len(result.substitutions)} files<br>{counts}</p>")
+        if result.failed:
+            failed = "<br>".join(f"{os.path.basename(path)}: {error}" for path, error in result.failed[:20])
+            message += f"<p><b>Failures:</b><br>{failed}</p>"
+        QMessageBox.information(self, "Bulk Operation Summary", message)
+
+    def open_file_in_meld(self, index):
         if not self.meld_available:
             return
-        file_path = item.data(Qt.UserRole)
+        from .meld import Meld
+        file_path = index.data(Qt.UserRole)
         self.meld_thread = Meld(self.meld_path, file_path)
         self.meld_thread.start()
 
-    def format_line(self, line):
-        if '=' in line:
-            key, value = line.split('=', 1)
-            return f'{key}={value}'
-        else:
-            return line
-
-    def add_file_to_list_widget(self, file_path):
-        item = QListWidgetItem(os.path.basename(file_path))
-        item.setData(Qt.UserRole, file_path)
-        self.file_list_widget.addItem(item)
+    def set_file_sort_mode(self):
+        mode = self.file_sort_field.currentData()
+        self.settings.setValue("Base/file_list_sort", mode)
+        self.file_list_model.set_sort_mode(mode)
 
     def toggle_regex_mode(self):
         self.start_filter_timer() # Re-trigger filtering with new regex mode
         self.regex_expression.setEnabled(not self.regex_expression.isEnabled())
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="iniForge: Bulk ini Files Manager")
+    parser.add_argument('-b', '--debug', action='store_true', default=False, help='Run tool in debug mode')
+    parser.add_argument('--profile-startup', action='store_true', default=False,
+                        help='Print how long each startup phase takes, up to the first shown window')
+    args = parser.parse_args(argv)
+    if args.debug:
+        print("####### DEBUG MODE ACTIVATED #######")
+        os.environ['IFORGE_LOG_LEVEL'] = 'debug'
+
     app = QApplication([])
     app.setApplicationName("iniForge")
     app.setOrganizationName("Arik Levi - Software Solutions, LLC")
@@ -1114,6 +1687,12 @@ def main():
     if os.path.exists(icon_path):
         app.setWindowIcon(QIcon(icon_path))
     
+    profile.mark("QApplication")
+    
     window = GUI()
     window.show()
+    profile.mark("Window shown")
+    if args.profile_startup:
+        # Runs once the event loop has processed the first paint
+        QTimer.singleShot(0, lambda: (profile.mark("First event loop pass"), profile.report()))
     app.exec()
@@ -0,0 +1,189 @@
+import json
+import zlib
+import threading
+from difflib import SequenceMatcher
+from . import core
+from .bulk_apply import BulkApplyExecutor
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+class HistoryConflict(Exception):
+    """The file changed since the step was recorded, it is left as it is."""
+
+class FileDelta:
+    """Compressed line-level difference between two versions of a file.
+
+    Only the changed hunks are kept, each with both its old and its new lines,
+    so the same delta can roll the file back (undo) or forward again (redo).
+    Digests of both versions make sure a delta is only applied to the exact
+    content it was computed from.
+    """
+
+    __slots__ = ('old_digest', 'new_digest', 'payload')
+
+    def __init__(self, old_content, new_content):
+        self.old_digest = core.text_digest(old_content)
+        self.new_digest = core.text_digest(new_content)
+        hunks = diff_hunks(core.split_lines(old_content), core.split_lines(new_content))
+        self.payload = zlib.compress(json.dumps(hunks).encode('utf-8'))
+
+    @property
+    def nbytes(self):
+        return len(self.payload) + 64  # Payload plus the two digests and object overhead, roughly
+
+    def hunks(self):
+        return json.loads(zlib.decompress(self.payload).decode('utf-8'))
+
+    def apply(self, content, reverse=False):
+        """Old content to new (or new to old when reverse), HistoryConflict if content is not the expected version."""
+        expected = self.new_digest if reverse else self.old_digest
+        if core.text_digest(content) != expected:
+            raise HistoryConflict("File was modified after the operation")
+        lines = core.split_lines(content)
+        result = []
+        position = 0
+        for i1, i2, j1, j2, old_lines, new_lines in self.hunks():
+            start, end, replacement = (j1, j2, old_lines) if reverse else (i1, i2, new_lines)
+            result.extend(lines[position:start])
+            result.extend(replacement)
+            position = end
+        result.extend(lines[position:])
+        return ''.join(result)
+
+def diff_hunks(old_lines, new_lines):
+    """[(i1, i2, j1, j2, old_lines[i1:i2], new_lines[j1:j2])] for every changed range."""
+    # Bulk edits usually touch a few lines, trimming the common ends keeps the matcher cheap on large files
+    prefix = 0
+    limit = min(len(old_lines), len(new_lines))
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while (suffix < limit - prefix
+           and old_lines[len(old_lines) - 1 - suffix] == new_lines[len(new_lines) - 1 - suffix]):
+        suffix += 1
+    old_middle = old_lines[prefix:len(old_lines) - suffix]
+    new_middle = new_lines[prefix:len(new_lines) - suffix]
+
+    hunks = []
+    matcher = SequenceMatcher(None, old_middle, new_middle, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != 'equal':
+            hunks.append((prefix + i1, prefix + i2, prefix + j1, prefix + j2, old_middle[i1:i2], new_middle[j1:j2]))
+    return hunks
+
+class HistoryStep:
+    """The file deltas of one bulk operation."""
+
+    def __init__(self, description):
+        self.description = description
+        self.deltas = {}  # path -> FileDelta
+        self.nbytes = 0
+        self.overflowed = False  # Exceeded the history budget while recording, cannot be undone
+        self.unrecorded = []  # Files edited as a stream, their changes are not kept
+
+    def paths(self):
+        return list(self.deltas)
+
+class HistoryRecorder:
+    """Collects the deltas of a running bulk operation; called from the apply threads."""
+
+    def __init__(self, history, description):
+        self.history = history
+        self.step = HistoryStep(description)
+        self._lock = threading.Lock()
+
+    def record(self, file_path, old_content, new_content):
+        step = self.step
+        if step.overflowed:
+            return
+        if old_content is None:
+            with self._lock:
+                step.unrecorded.append(file_path)
+            return
+        delta = FileDelta(old_content, new_content)
+        with self._lock:
+            if step.overflowed:
+                return
+            step.deltas[file_path] = delta
+            step.nbytes += delta.nbytes
+            if step.nbytes > self.history.max_bytes:
+                # Stop holding memory for a step that can never fit in the history
+                step.overflowed = True
+                step.deltas = {}
+                step.nbytes = 0
+
+    def finish(self):
+        """Push the recorded step on the undo stack; returns False if it was too large to keep."""
+        if self.step.overflowed:
+            return False
+        if self.step.deltas:
+            self.history.push(self.step)
+        return True
+
+class UndoHistory:
+    """Undo and redo stacks of bulk operations, bounded by the memory their deltas use.
+
+    The oldest steps are dropped first when the budget is exceeded. Undoing or
+    redoing a step only rewrites the files that step changed.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.undo_stack = []
+        self.redo_stack = []
+
+    def recorder(self, description):
+        return HistoryRecorder(self, description)
+
+    def push(self, step):
+        self.undo_stack.append(step)
+        self.redo_stack = []  # A new change invalidates what was undone before it
+        self._trim()
+
+    def _trim(self):
+        while self.undo_stack and self.nbytes() > self.max_bytes:
+            self.undo_stack.pop(0)
+        while self.redo_stack and self.nbytes() > self.max_bytes:
+            self.redo_stack.pop(0)
+
+    def nbytes(self):
+        return sum(step.nbytes for step in self.undo_stack) + sum(step.nbytes for step in self.redo_stack)
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def undo_step(self):
+        """Step undone next, moved to the redo stack (whatever the outcome on disk)."""
+        step = self.undo_stack.pop()
+        self.redo_stack.append(step)
+        return step
+
+    def redo_step(self):
+        step = self.redo_stack.pop()
+        self.undo_stack.append(step)
+        return step
+
+    def clear(self):
+        self.undo_stack = []
+        self.redo_stack = []
+
+class RestoreExecutor(BulkApplyExecutor):
+    """Undoes (reverse=True) or redoes a history step over its files, in parallel like a bulk apply."""
+
+    def __init__(self, step, reverse, workers=0):
+        super().__init__(None, workers)
+        self.step = step
+        self.reverse = reverse
+
+    def apply_file(self, file_path):
+        return restore_file(file_path, self.step.deltas[file_path], self.reverse), {}
+
+def restore_file(file_path, delta, reverse):
+    """Roll a file back (reverse=True) or forward with a delta. Returns True once written."""
+    with open(file_path, 'r') as f:
+        content = f.read()
+    core.write_text_atomic(file_path, delta.apply(content, reverse))
+    return True
@@ -0,0 +1,188 @@
+import re
+from .section_layout import split_lines
+
+# Same header rule as section discovery: optional indent, '[', name up to the last ']' on the line
+HEADER_RE = re.compile(r'[ \t]*\[([^\r\n]+)\]')
+# indent, key, delimiter with its spacing, value
+ENTRY_RE = re.compile(r'(?P<indent>[ \t]*)(?P<key>[^\s;#\[=:][^=:]*?)(?P<sep>[ \t]*[=:][ \t]*)(?P<value>.*)')
+
+OPERATION_TYPES = ('set_key', 'delete_key', 'rename_key', 'rename_section')
+
+class IniSection:
+    """A section occurrence: header line and the line it ends at (exclusive)."""
+
+    __slots__ = ('name', 'header', 'end')
+
+    def __init__(self, name, header, end=None):
+        self.name = name
+        self.header = header
+        self.end = end
+
+class IniEntry:
+    """A key line (plus its indented continuation lines) inside a section."""
+
+    __slots__ = ('section', 'start', 'end', 'match')
+
+    def __init__(self, section, start, end, match):
+        self.section = section
+        self.start = start
+        self.end = end  # Exclusive, continuation lines included
+        self.match = match
+
+    @property
+    def key(self):
+        return self.match.group('key')
+
+class IniDocument:
+    """Lossless, line-based model of an INI file for key-level edits.
+
+    The file is kept as its original lines; edits only rewrite, insert or drop
+    the lines they target, so comments, spacing, ordering and line endings of
+    everything else round-trip unchanged. Keys match case-insensitively and
+    section names exactly, like configparser. Duplicate sections and keys are
+    all edited, so the value a reader ends up with is the one that was set.
+    """
+
+    def __init__(self, content):
+        self.lines = split_lines(content)
+        self._index()
+
+    def text(self):
+        return ''.join(self.lines)
+
+    def _index(self):
+        self.sections = []
+        for i, line in enumerate(self.lines):
+            match = HEADER_RE.match(line)
+            if match:
+                if self.sections:
+                    self.sections[-1].end = i
+                self.sections.append(IniSection(match.group(1), i))
+        if self.sections:
+            self.sections[-1].end = len(self.lines)
+
+    def find_sections(self, name):
+        return [section for section in self.sections if section.name == name]
+
+    def entries(self, section):
+        """Key entries of a section occurrence, in file order."""
+        entries = []
+        i = section.header + 1
+        while i < section.end:
+            body = self.lines[i].rstrip('\r\n')
+            match = ENTRY_RE.match(body)
+            i += 1
+            if not match:
+                continue
+            indent = len(match.group('indent'))
+            start = i - 1
+            # configparser continuation: following non-blank lines indented deeper than the key (comments are kept apart)
+            while i < section.end:
+                following = self.lines[i].rstrip('\r\n')
+                stripped = following.strip()
+                if not stripped or stripped[0] in ';#' or len(following) - len(following.lstrip()) <= indent:
+                    break
+                i += 1
+            entries.append(IniEntry(section, start, i, match))
+        return entries
+
+    def find_entries(self, section_name, key):
+        key = key.strip().lower()
+        return [entry for section in self.find_sections(section_name)
+                for entry in self.entries(section) if entry.key.lower() == key]
+
+    @staticmethod
+    def _eol(line):
+        return line[len(line.rstrip('\r\n')):]
+
+    def _entry_line(self, entry, key=None, value=None):
+        match = entry.match
+        key = match.group('key') if key is None else key
+        value = match.group('value') if value is None else value
+        return f"{match.group('indent')}{key}{match.group('sep')}{value}{self._eol(self.lines[entry.start])}"
+
+    def _separator(self, sections):
+        """Delimiter style of the existing entries ('key = value' vs 'key=value')."""
+        for section in sections or self.sections:
+            for entry in self.entries(section):
+                return entry.match.group('sep')
+        return '='
+
+    def set_key(self, section_name, key, value):
+        """Set key to value in section, adding the key (and the section) if missing."""
+        entries = self.find_entries(section_name, key)
+        if entries:
+            changed = False
+            for entry in reversed(entries):  # Bottom up, so earlier positions stay valid
+                line = self._entry_line(entry, value=value)
+                if entry.end - entry.start != 1 or self.lines[entry.start] != line:
+                    self.lines[entry.start:entry.end] = [line]
+                    changed = True
+            if changed:
+                self._index()
+            return changed
+
+        sections = self.find_sections(section_name)
+        line = f"{key}{self._separator(sections)}{value}\n"
+        if sections:
+            section = sections[0]
+            section_entries = self.entries(section)
+            position = section_entries[-1].end if section_entries else section.header + 1
+            if position > 0 and not self.lines[position - 1].endswith('\n'):
+                self.lines[position - 1] += '\n'
+            self.lines.insert(position, line)
+        else:
+            if self.lines and not self.lines[-1].endswith('\n'):
+                self.lines[-1] += '\n'
+            self.lines.extend([f"[{section_name}]\n", line])
+        self._index()
+        return True
+
+    def delete_key(self, section_name, key):
+        entries = self.find_entries(section_name, key)
+        for entry in reversed(entries):
+            del self.lines[entry.start:entry.end]
+        if entries:
+            self._index()
+        return bool(entries)
+
+    def rename_key(self, section_name, key, new_key):
+        changed = False
+        for entry in self.find_entries(section_name, key):
+            line = self._entry_line(entry, key=new_key)
+            if self.lines[entry.start] != line:
+                self.lines[entry.start] = line
+                changed = True
+        if changed:
+            self._index()
+        return changed
+
+    def rename_section(self, section_name, new_name):
+        changed = False
+        for section in self.find_sections(section_name):
+            line = self.lines[section.header]
+            match = HEADER_RE.match(line)
+            self.lines[section.header] = f"{line[:match.start(1)]}{new_name}{line[match.end(1):]}"
+            changed = changed or new_name != section_name
+        if changed:
+            self._index()
+        return changed
+
+    def apply(self, operation):
+        """Apply one structured operation dict, returns True if the document changed.
+
+            {'type': 'set_key', 'section': str, 'key': str, 'value': str}
+            {'type': 'delete_key', 'section': str, 'key': str}
+            {'type': 'rename_key', 'section': str, 'key': str, 'new_key': str}
+            {'type': 'rename_section', 'section': str, 'new_section': str}
+        """
+        kind = operation['type']
+        if kind == 'set_key':
+            return self.set_key(operation['section'], operation['key'], operation['value'])
+        if kind == 'delete_key':
+            return self.delete_key(operation['section'], operation['key'])
+        if kind == 'rename_key':
+            return self.rename_key(operation['section'], operation['key'], operation['new_key'])
+        if kind == 'rename_section':
+            return self.rename_section(operation['section'], operation['new_section'])
+        raise ValueError(f"Unknown operation type: {kind}")
@@ -0,0 +1,213 @@
+import os
+import re
+import hashlib
+from . import core
+
+def compile_extensions(extensions):
+    """Build a single case-insensitive pattern matching any of the given file extensions."""
+    exts = [re.escape(ext.strip().lstrip('.')) for ext in extensions if ext and ext.strip()]
+    if not exts:
+        exts = ['ini']
+    return re.compile(r'\.(?:%s)$' % '|'.join(exts), re.IGNORECASE)
+
+class FileEntry:
+    """A single configuration file known to the workspace inventory."""
+    __slots__ = ('path', 'name', 'size', 'mtime', 'digest', 'sections')
+
+    def __init__(self, path, name, size, mtime):
+        self.path = path
+        self.name = name
+        self.size = size
+        self.mtime = mtime
+        self.digest = None
+        self.sections = None  # Parsed lazily, see WorkspaceInventory.sections()
+
+    def __repr__(self):
+        return f"FileEntry({self.path!r}, size={self.size}, mtime={self.mtime})"
+
+class WorkspaceInventory:
+    """In-memory list of the configuration files under a working directory.
+
+    The tree is walked once per scan with os.scandir and every consumer (file list,
+    content filter, section discovery) is served from the recorded entries.
+    """
+
+    def __init__(self):
+        self.folder_path = None
+        self.extensions = []
+        self.extension_regex = compile_extensions([])
+        self._entries = {}
+        self._directories = set()
+
+    def scan(self, folder_path, extensions):
+        """Walk folder_path once and record every file matching the extensions."""
+        self.folder_path = folder_path
+        self.extensions = list(extensions)
+        self.extension_regex = compile_extensions(self.extensions)
+        self._entries = {}
+        self._directories = set()
+        if not folder_path or not os.path.isdir(folder_path):
+            return self
+        self._scan_tree(folder_path)
+        return self
+
+    def _scan_tree(self, top):
+        # Depth-first, directories visited in listing order, same as os.walk top-down
+        found = []
+        pending = [top]
+        while pending:
+            subdirs, files = self._scan_directory(pending.pop())
+            found.extend(files)
+            pending.extend(reversed(subdirs))
+        return found
+
+    def _scan_directory(self, dir_path):
+        subdirs = []
+        files = []
+        match = self.extension_regex.search
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                            continue
+                        if not match(entry.name):
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    self._entries[entry.path] = FileEntry(entry.path, entry.name, st.st_size, st.st_mtime_ns)
+                    files.append(entry.path)
+        except OSError:
+            return subdirs, files
+        self._directories.add(dir_path)
+        return subdirs, files
+
+    def refresh_directory(self, dir_path):
+        """Re-read a single directory after a change notification.
+
+        Files directly inside dir_path are re-listed, new subdirectories are walked and
+        vanished ones are dropped. Returns (added, removed, modified) path lists.
+        """
+        added, removed, modified = [], [], []
+        if not os.path.isdir(dir_path):
+            removed = self._forget_tree(dir_path)
+            return added, removed, modified
+
+        before = {path: self._entries.pop(path) for path in list(self._entries)
+                  if os.path.dirname(path) == dir_path}
+        known_subdirs = set(d for d in self._directories if os.path.dirname(d) == dir_path)
+        subdirs, files = self._scan_directory(dir_path)
+        for path in files:
+            old = before.pop(path, None)
+            new = self._entries[path]
+            if old is None:
+                added.append(path)
+            elif (old.size, old.mtime) != (new.size, new.mtime):
+                modified.append(path)
+            else:
+                self._entries[path] = old  # Keep parsed data of untouched files
+        removed.extend(before)
+        for subdir in subdirs:
+            if subdir not in known_subdirs:
+                added.extend(self._scan_tree(subdir))
+        for subdir in known_subdirs - set(subdirs):
+            removed.extend(self._forget_tree(subdir))
+        return added, removed, modified
+
+    def refresh_files(self, file_paths):
+        """Re-stat known files. Returns (removed, modified) path lists."""
+        removed, modified = [], []
+        for path in file_paths:
+            entry = self._entries.get(path)
+            if entry is None:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self._entries[path]
+                removed.append(path)
+                continue
+            if (st.st_size, st.st_mtime_ns) != (entry.size, entry.mtime):
+                self._entries[path] = FileEntry(path, entry.name, st.st_size, st.st_mtime_ns)
+                modified.append(path)
+        return removed, modified
+
+    def _forget_tree(self, dir_path):
+        prefix = os.path.join(dir_path, '')
+        self._directories = set(d for d in self._directories if d != dir_path and not d.startswith(prefix))
+        removed = [path for path in self._entries if path.startswith(prefix)]
+        for path in removed:
+            del self._entries[path]
+        return removed
+
+    def directories(self):
+        return sorted(self._directories)
+
+    def sections(self, cache=None):
+        """Return the sorted union of section names across the inventory."""
+        all_sections = set()
+        for sections in self.iter_sections(cache):
+            all_sections.update(sections)
+        return sorted(all_sections)
+
+    def iter_sections(self, cache=None, is_cancelled=None):
+        """Yield the section list of every file in the inventory.
+
+        With a ScanCache, files whose size and mtime match the cached record are not
+        re-read, and files that were touched but whose content hash is unchanged are
+        not re-parsed. Results are written back to the cache once all files were seen.
+        Safe to run on a worker thread: it iterates a snapshot of the entries.
+        """
+        is_cancelled = is_cancelled or (lambda: False)
+        folder_path = self.folder_path
+        entries = list(self._entries.values())
+        cached = cache.load(folder_path) if cache and folder_path else {}
+        updated = {}
+        for entry in entries:
+            if is_cancelled():
+                return
+            if entry.sections is None:
+                record = cached.get(entry.path)
+                if record and record[0] == entry.size and record[1] == entry.mtime:
+                    entry.digest, entry.sections = record[2], record[3]
+                else:
+                    self._read_sections(entry, record)
+                    updated[entry.path] = (entry.size, entry.mtime, entry.digest, entry.sections)
+            yield entry.sections
+        if cache and folder_path and (updated or len(cached) != len(entries)):
+            cache.store(folder_path, updated, keep_paths=[entry.path for entry in entries])
+
+    @staticmethod
+    def _read_sections(entry, record=None):
+        try:
+            with open(entry.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            entry.digest, entry.sections = '', []
+            return
+        entry.digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        if record and record[2] == entry.digest:
+            entry.sections = record[3]
+        else:
+            entry.sections = core.section_names(data)
+
+    def matches_extension(self, file_name):
+        return self.extension_regex.search(file_name) is not None
+
+    def entries(self):
+        return list(self._entries.values())
+
+    def paths(self):
+        return list(self._entries)
+
+    def get(self, file_path):
+        return self._entries.get(file_path)
+
+    def __contains__(self, file_path):
+        return file_path in self._entries
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,117 @@
+import os
+import json
+import time
+import threading
+
+class ApplyJournal:
+    """Write-ahead journal of a bulk apply, so an interrupted run can be resumed.
+
+    One JSON record per line, appended next to the application config.ini:
+        {"kind": "begin", "operations": [...], "files": [...], "plans": {file: [...]} or null, "started": float}
+        {"kind": "intent", "file": str, "before": digest, "after": digest}
+        {"kind": "commit", "file": str, "modified": bool}
+
+    The intent record is written before a file is atomically replaced and the
+    commit record once the replace is done. A file with an intent but no commit
+    was being written when the run died: its current digest tells whether the
+    new content made it to disk. The journal is removed when a run ends normally,
+    so an existing journal always means an interrupted run.
+    """
+
+    def __init__(self, path, operations, file_paths, committed=(), plans=None):
+        self.path = path
+        self.operations = operations
+        self.file_paths = file_paths
+        self.plans = plans  # Per-file plans of a table-driven run, instead of one plan for all files
+        self.committed = set(committed)
+        self._lock = threading.Lock()
+        self._file = None
+
+    @classmethod
+    def create(cls, path, operations, file_paths, plans=None):
+        """Start a new journal for a run, replacing any previous one."""
+        journal = cls(path, operations, file_paths, plans=plans)
+        journal._file = open(path, 'w', encoding='utf-8')
+        journal._append({'kind': 'begin', 'operations': operations, 'files': file_paths, 'plans': plans,
+                         'started': time.time()})
+        return journal
+
+    @classmethod
+    def load(cls, path, digest_file=None):
+        """Read an interrupted run back, or return None if there is none (or it is unreadable).
+
+        digest_file(path) returns the digest of a file as it is now; it resolves
+        files whose last record is an intent.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            return None
+
+        header = None
+        intents = {}
+        committed = set()
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break  # Torn last line from the crash, everything before it is valid
+            kind = record.get('kind')
+            if kind == 'begin':
+                header = record
+            elif kind == 'intent':
+                intents[record['file']] = record['after']
+            elif kind == 'commit':
+                committed.add(record['file'])
+                intents.pop(record['file'], None)
+        if header is None:
+            return None
+
+        for file_path, after in intents.items():
+            try:
+                if digest_file and digest_file(file_path) == after:
+                    committed.add(file_path)  # Replaced on disk, only the commit record was lost
+            except OSError:
+                pass
+        return cls(path, header['operations'], header['files'], committed, header.get('plans'))
+
+    def resume(self):
+        """Reopen a loaded journal for appending; returns the files still to process."""
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return self.remaining()
+
+    def remaining(self):
+        return [file_path for file_path in self.file_paths if file_path not in self.committed]
+
+    def intent(self, file_path, before, after):
+        self._append({'kind': 'intent', 'file': file_path, 'before': before, 'after': after})
+
+    def commit(self, file_path, modified):
+        self.committed.add(file_path)
+        self._append({'kind': 'commit', 'file': file_path, 'modified': modified})
+
+    def _append(self, record):
+        # Called from the apply threads; flushed per record so a killed process loses at most the line being written
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def finish(self):
+        """Close and remove the journal, the run is over."""
+        self.close()
+        self.discard(self.path)
+
+    @staticmethod
+    def discard(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,113 @@
+import re
+import bisect
+from array import array
+from itertools import accumulate
+from . import core
+
+try:
+    import numpy as np  # Optional: finds newlines at memory speed, the fallback below is a few times slower
+except ImportError:
+    np = None
+
+INDEX_CHUNK_SIZE = 8 * 1024 * 1024
+MAX_LINE_CHARS = 4096  # Longer lines are cut when displayed
+
+def line_starts(chunk, base):
+    """Offsets just past every '\\n' of a chunk of bytes found at offset base."""
+    if np is not None:
+        found = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == 0x0A).astype(np.int64)
+        found += base + 1
+        starts = array('q')
+        starts.frombytes(found.tobytes())
+        return starts
+    lengths = (len(part) + 1 for part in chunk.split(b'\n')[:-1])
+    starts = array('q', accumulate(lengths, initial=base))
+    return starts[1:]
+
+class LineIndex:
+    """Start offsets of every line of a byte buffer (usually a memory-mapped file).
+
+    The index is built a chunk at a time by index_step(), so a caller can
+    keep its event loop running while a large file is indexed, and lines can
+    be shown as soon as their chunk is done. Line n is then found in constant
+    time, and the line holding a byte offset with a binary search.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.size = len(data)
+        self.starts = array('q', [0])
+        self.scanned = 0
+
+    @property
+    def complete(self):
+        return self.scanned >= self.size
+
+    def index_step(self, max_bytes=INDEX_CHUNK_SIZE):
+        """Index the next chunk; returns True once the whole buffer is indexed."""
+        if not self.complete:
+            end = min(self.scanned + max_bytes, self.size)
+            self.starts.extend(line_starts(self.data[self.scanned:end], self.scanned))
+            self.scanned = end
+        return self.complete
+
+    def build(self):
+        while not self.index_step():
+            pass
+        return self
+
+    def line_count(self):
+        """Lines known so far: all of them once complete (a final newline does not start a line)."""
+        if not self.complete:
+            return len(self.starts) - 1  # The last one may still grow
+        if self.size and self.starts[-1] == self.size:
+            return len(self.starts) - 1
+        return len(self.starts) if self.size else 0
+
+    def line_span(self, line):
+        """(start, end) byte offsets of a line, line ending excluded."""
+        start = self.starts[line]
+        end = self.starts[line + 1] - 1 if line + 1 < len(self.starts) else self.size
+        if end > start and self.data[end - 1:end] == b'\r':
+            end -= 1
+        return start, end
+
+    def line_text(self, line, max_chars=MAX_LINE_CHARS):
+        start, end = self.line_span(line)
+        # Up to 4 bytes per character, so no more than that is ever decoded
+        raw = self.data[start:min(end, start + max_chars * 4)]
+        return raw.decode(core.ENCODING, errors='replace')[:max_chars]
+
+    def line_at(self, offset):
+        """Line holding a byte offset."""
+        return bisect.bisect_right(self.starts, offset) - 1
+
+    def find(self, text, offset=0, case_sensitive=False, backwards=False):
+        """(start, end) byte offsets of the next match of text from offset (before it when backwards), or None."""
+        try:
+            needle = text.encode(core.ENCODING)
+        except UnicodeEncodeError:
+            return None
+        if not needle:
+            return None
+        if case_sensitive:
+            position = self.data.rfind(needle, 0, offset + len(needle) - 1) if backwards else self.data.find(needle, offset)
+            return (position, position + len(needle)) if position != -1 else None
+        pattern = re.compile(re.escape(needle), re.IGNORECASE)
+        if not backwards:
+            match = pattern.search(self.data, offset)
+            return match.span() if match else None
+        # Backwards: the last match of each chunk, walking towards the start of the file
+        end = offset
+        while end > 0:
+            start = max(0, end - INDEX_CHUNK_SIZE)
+            limit = min(end + len(needle) - 1, self.size)
+            last = None
+            match = pattern.search(self.data, start, limit)
+            while match is not None and match.start() < end:
+                last = match
+                match = pattern.search(self.data, match.start() + 1, limit)  # Matches may overlap
+            if last is not None:
+                return last.span()
+            end = start
+        return None
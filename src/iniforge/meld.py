@@ -1,3 +1,4 @@
+import shutil
 import platform
 import subprocess
 from pathlib import Path
@@ -21,10 +22,8 @@ class Meld(QThread):
                 if path.exists():
                     return str(path)
         elif system in ["Linux", "Darwin"]:
-            # For Linux/Mac, check if meld is in PATH
-            result = subprocess.run(["which", "meld"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
+            # For Linux/Mac, check if meld is in PATH (a PATH lookup, no 'which' subprocess)
+            return shutil.which("meld")
         
         return None
     
@@ -0,0 +1,141 @@
+import os
+import sqlite3
+from contextlib import closing
+
+class ScanCache:
+    """Persistent per-file scan results (size, mtime, content hash, sections and trigram signature).
+
+    Stored as a small SQLite database next to the application config.ini, so a
+    workspace opened on a previous run only needs its new or changed files re-read.
+    """
+
+    SCHEMA_VERSION = 4
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.available = True
+        try:
+            with closing(self._connect()) as conn:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version != self.SCHEMA_VERSION:
+                    conn.execute("DROP TABLE IF EXISTS files")
+                    conn.execute("DROP TABLE IF EXISTS trigrams")
+                    conn.execute("PRAGMA user_version = %d" % self.SCHEMA_VERSION)
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS files ("
+                    " workspace TEXT NOT NULL,"
+                    " path TEXT NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " mtime INTEGER NOT NULL,"
+                    " digest TEXT NOT NULL,"
+                    " sections TEXT NOT NULL,"
+                    " PRIMARY KEY (workspace, path))"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS trigrams ("
+                    " workspace TEXT NOT NULL,"
+                    " path TEXT NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " mtime INTEGER NOT NULL,"
+                    " bits INTEGER NOT NULL,"
+                    " signature BLOB NOT NULL,"
+                    " PRIMARY KEY (workspace, path))"
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"Scan cache disabled ({self.db_path}): {e}")
+            self.available = False
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    @staticmethod
+    def _workspace_key(folder_path):
+        return os.path.normcase(os.path.abspath(folder_path))
+
+    def load(self, folder_path):
+        """Return {path: (size, mtime, digest, sections)} recorded for the workspace."""
+        if not self.available:
+            return {}
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT path, size, mtime, digest, sections FROM files WHERE workspace = ?",
+                    (self._workspace_key(folder_path),)
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error reading scan cache: {e}")
+            return {}
+        return {path: (size, mtime, digest, sections.split('\n') if sections else [])
+                for path, size, mtime, digest, sections in rows}
+
+    def store(self, folder_path, records, keep_paths=None):
+        """Upsert records ({path: (size, mtime, digest, sections)}) for the workspace.
+
+        When keep_paths is given, rows for any other path of the workspace are dropped.
+        """
+        if not self.available:
+            return
+        workspace = self._workspace_key(folder_path)
+        try:
+            with closing(self._connect()) as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO files (workspace, path, size, mtime, digest, sections) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(workspace, path, size, mtime, digest, '\n'.join(sections))
+                     for path, (size, mtime, digest, sections) in records.items()]
+                )
+                if keep_paths is not None:
+                    stale = set(path for (path,) in conn.execute(
+                        "SELECT path FROM files WHERE workspace = ?", (workspace,))) - set(keep_paths)
+                    for table in ("files", "trigrams"):
+                        conn.executemany(f"DELETE FROM {table} WHERE workspace = ? AND path = ?",
+                                         [(workspace, path) for path in stale])
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error writing scan cache: {e}")
+
+    def load_trigrams(self, folder_path):
+        """Return {path: (size, mtime, bits, mask)} trigram signatures recorded for the workspace."""
+        if not self.available:
+            return {}
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT path, size, mtime, bits, signature FROM trigrams WHERE workspace = ?",
+                    (self._workspace_key(folder_path),)
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error reading scan cache: {e}")
+            return {}
+        return {path: (size, mtime, bits, int.from_bytes(signature, 'little'))
+                for path, size, mtime, bits, signature in rows}
+
+    def store_trigrams(self, folder_path, records):
+        """Upsert trigram signatures ({path: (size, mtime, bits, mask)}) for the workspace."""
+        if not self.available:
+            return
+        workspace = self._workspace_key(folder_path)
+        try:
+            with closing(self._connect()) as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO trigrams (workspace, path, size, mtime, bits, signature) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(workspace, path, size, mtime, bits, mask.to_bytes(bits // 8, 'little'))
+                     for path, (size, mtime, bits, mask) in records.items()]
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error writing scan cache: {e}")
+
+    def clear(self, folder_path=None):
+        if not self.available:
+            return
+        try:
+            with closing(self._connect()) as conn:
+                for table in ("files", "trigrams"):
+                    if folder_path is None:
+                        conn.execute(f"DELETE FROM {table}")
+                    else:
+                        conn.execute(f"DELETE FROM {table} WHERE workspace = ?", (self._workspace_key(folder_path),))
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error clearing scan cache: {e}")
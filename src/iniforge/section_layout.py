@@ -0,0 +1,142 @@
+def split_lines(content):
+    """Split text into lines keeping '\n', exactly like readlines() on a text-mode file."""
+    lines = content.split('\n')
+    tail = lines.pop()
+    lines = [f"{line}\n" for line in lines]
+    if tail:
+        lines.append(tail)
+    return lines
+
+class SectionSpan:
+    """Line positions of one section: header, first non-comment line and end."""
+
+    __slots__ = ('name', 'header', 'body_start', 'end')
+
+    def __init__(self, name, header):
+        self.name = name
+        self.header = header  # Index of the [name] line
+        self.body_start = None  # First line after the header that is not a ';' comment
+        self.end = None  # Next line starting with '[' (or the line count)
+
+class SectionLayout:
+    """Section positions of a list of lines, built in a single pass.
+
+    Follows the rules of the original insertion code: a section is the first
+    line equal to [name] once stripped, its body starts after the ';' comments
+    that follow the header and it ends at the next line starting with '['.
+    """
+
+    def __init__(self, lines):
+        self.line_count = len(lines)
+        self.sections = {}  # name -> SectionSpan, first occurrence only
+        current = None
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            if stripped.startswith('['):
+                if current is not None:
+                    if current.body_start is None:
+                        current.body_start = i
+                    current.end = i
+                    current = None
+                name = stripped[1:-1]
+                if stripped.endswith(']') and len(stripped) > 1 and name not in self.sections:
+                    current = self.sections[name] = SectionSpan(name, i)
+            elif current is not None and current.body_start is None and not stripped.startswith(';'):
+                current.body_start = i
+        if current is not None:
+            if current.body_start is None:
+                current.body_start = len(lines)  # Only comments up to the end of file
+            current.end = len(lines)
+
+    def insertion_index(self, section, add_at_start=False):
+        """(line index, section found), the same answer as core.get_section_line_index."""
+        span = self.sections.get(section)
+        if span is None:
+            return self.line_count, False
+        return (span.body_start if add_at_start else span.end), True
+
+def is_structural(line):
+    """Lines that can move a section boundary: headers (or anything starting with '[') and ';' comments."""
+    stripped = line.strip()
+    return stripped.startswith('[') or stripped.startswith(';')
+
+def insert_lines(lines, section, config_lines, add_at_start, layout=None):
+    """Insert config_lines into section of a line list in place (at the end of file if the section is missing).
+
+    This is the original insertion behaviour, including the extra newline added
+    at the end of file when inserting before the last line.
+    """
+    layout = layout or SectionLayout(lines)
+    line_index, section_found = layout.insertion_index(section, add_at_start)
+    if not section_found:
+        # Add a newline before the section if file is not empty and doesn't end with newline
+        if lines and not lines[-1].endswith('\n'):
+            lines.append('\n')
+        lines.append(f"[{section}]\n")
+        lines.extend(config_lines)
+    else:
+        if line_index == len(lines) - 1:  # If at end of file
+            lines.append('\n')  # Add newline before content
+        lines[line_index:line_index] = config_lines
+
+class InsertionBatch:
+    """Many insertions into one file in O(lines + inserted lines).
+
+    The layout of the original lines is computed once. Inserted blocks are kept
+    in the gaps between original lines and only merged by lines(), so positions
+    never shift. A block inserted at the start of a section goes in front of the
+    blocks already in its gap, one inserted at the end goes behind them: the
+    same order as running the insertions one after the other, as long as the
+    inserted lines contain no header or comment lines. Insertions that do (or
+    that create a missing section) merge the gaps and re-layout the file.
+    """
+
+    def __init__(self, lines):
+        self._reset(lines)
+
+    def _reset(self, lines):
+        self.base = lines
+        self.layout = SectionLayout(lines)
+        self.front = {}  # gap index -> blocks inserted at the front, most recent last
+        self.back = {}  # gap index -> blocks inserted at the back, oldest first
+        self.sizes = {}  # gap index -> number of inserted lines
+
+    def insert(self, section, config_lines, add_at_start):
+        span = self.layout.sections.get(section)
+        gap = None if span is None else (span.body_start if add_at_start else span.end)
+        # A line without its newline joins the next one, that can reshape the file as well
+        joins_last_line = gap is not None and gap >= len(self.base) - 1 and self.base and not self.base[-1].endswith('\n')
+        if (span is None or joins_last_line
+                or any(is_structural(line) or not line.endswith('\n') for line in config_lines)):
+            lines = split_lines(''.join(self.lines()))
+            insert_lines(lines, section, config_lines, add_at_start)
+            self._reset(split_lines(''.join(lines)))
+            return
+
+        count = self.layout.line_count
+        if gap >= count - 1:
+            # Lines after the insertion point, to replicate the newline added before the last line
+            after = (0 if not add_at_start else self.sizes.get(gap, 0)) + (count - gap) + \
+                    (self.sizes.get(count, 0) if gap < count else 0)
+            if after == 1:
+                self._add(self.back, count, ['\n'])
+        self._add(self.front if add_at_start else self.back, gap, list(config_lines))
+
+    def _add(self, blocks, gap, block):
+        blocks.setdefault(gap, []).append(block)
+        self.sizes[gap] = self.sizes.get(gap, 0) + len(block)
+
+    def lines(self):
+        if not self.sizes:
+            return list(self.base)
+        result = []
+        previous = 0
+        for gap in sorted(self.sizes):
+            result.extend(self.base[previous:gap])
+            for block in reversed(self.front.get(gap, ())):
+                result.extend(block)
+            for block in self.back.get(gap, ()):
+                result.extend(block)
+            previous = gap
+        result.extend(self.base[previous:])
+        return result
@@ -0,0 +1,37 @@
+import time
+from PySide6.QtCore import QThread, Signal
+
+class SectionScanWorker(QThread):
+    """Collects section names of the workspace files off the GUI thread."""
+    # Section names not reported before, sorted
+    batch = Signal(list)
+    # Every section name found, sorted
+    signal = Signal(list)
+
+    BATCH_INTERVAL = 0.2  # seconds
+
+    def __init__(self, inventory, cache=None):
+        super().__init__()
+        self.inventory = inventory
+        self.cache = cache
+
+    def run(self):
+        found = set()
+        pending = set()
+        last_emit = time.monotonic()
+        for sections in self.inventory.iter_sections(self.cache, self.isInterruptionRequested):
+            for section in sections:
+                if section not in found:
+                    found.add(section)
+                    pending.add(section)
+            now = time.monotonic()
+            if pending and now - last_emit >= self.BATCH_INTERVAL:
+                last_emit = now
+                self.batch.emit(sorted(pending))
+                pending = set()
+
+        if self.isInterruptionRequested():
+            return
+        if pending:
+            self.batch.emit(sorted(pending))
+        self.signal.emit(sorted(found))
@@ -0,0 +1,30 @@
+import sys
+import time
+
+class StartupProfile:
+    """Timestamps of the startup phases, printed by 'iniforge --profile-startup'.
+
+    Marks are cheap and always taken; the breakdown is only printed when asked
+    for. Times are relative to the first import of the GUI module, so the
+    interpreter start itself is not included.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks = []  # (label, perf_counter)
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter()))
+
+    def report(self, stream=None):
+        stream = stream or sys.stderr
+        stream.write("iniForge startup profile (ms):\n")
+        previous = self.started
+        for label, stamp in self.marks:
+            stream.write(f"  {(stamp - previous) * 1000:8.1f}  {label}\n")
+            previous = stamp
+        stream.write(f"  {(previous - self.started) * 1000:8.1f}  total\n")
+        stream.flush()
+
+# Created on first import, i.e. when the GUI module starts importing
+profile = StartupProfile()
@@ -0,0 +1,157 @@
+import re
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse, sre_constants
+
+MIN_BITS = 512
+MAX_BITS = 65536
+CHUNK_SIZE = 1024 * 1024
+# Memory all in-memory signatures of a share may take together; large shares get smaller signatures
+SIGNATURES_MEMORY = 32 * 1024 * 1024
+
+# ASCII letters that IGNORECASE also matches to a non-ASCII character (U+017F long s,
+# U+212A Kelvin sign, U+0130/U+0131 dotted and dotless I). Lowercased byte trigrams
+# cannot see those matches, so required literals are cut at these letters.
+UNICODE_FOLDED = re.compile('[iks]', re.IGNORECASE | re.ASCII)
+
+def trigrams(data):
+    """Distinct lowercased byte trigrams of a buffer, as 24-bit integers, read in bounded chunks."""
+    tris = set()
+    for start in range(0, max(len(data) - 2, 0), CHUNK_SIZE):
+        chunk = bytes(data[start:start + CHUNK_SIZE + 2]).lower()  # Overlap so no trigram is cut
+        tris.update(zip(chunk, chunk[1:], chunk[2:]))  # Tuples of ints hash faster than 3-byte slices
+    return {a << 16 | b << 8 | c for a, b, c in tris}
+
+def _bit(trigram, bits):
+    # Stable across runs (signatures are persisted), unlike hash(). Multiplicative
+    # hashing mixes into the high bits, so those are kept (bits is a power of two).
+    return ((trigram * 0x9E3779B1) & 0xFFFFFFFF) >> (33 - bits.bit_length())
+
+def max_signature_bits(file_count):
+    """Largest signature size that keeps a share of file_count files within SIGNATURES_MEMORY."""
+    bits = MAX_BITS
+    while bits > MIN_BITS and file_count * bits // 8 > SIGNATURES_MEMORY:
+        bits //= 2
+    return bits
+
+def make_signature(tris, max_bits=MAX_BITS):
+    """Fold a trigram set into a Bloom-style bitmask sized to the number of trigrams."""
+    bits = MIN_BITS
+    while bits < 4 * len(tris) and bits < max_bits:
+        bits *= 2
+    # Bits set in a bytearray, not with |= on an int that would be copied for every trigram
+    signature = bytearray(bits // 8)
+    for position in {_bit(trigram, bits) for trigram in tris}:
+        signature[position >> 3] |= 1 << (position & 7)
+    return bits, int.from_bytes(signature, 'little')
+
+def required_literals(regex):
+    """Literal strings every match of the regex must contain.
+
+    Walks the parsed pattern and collects runs of consecutive literal characters
+    that are not optional: alternations, optional repeats and character classes
+    end a run. Returns an empty list when nothing can be guaranteed.
+    """
+    try:
+        parsed = sre_parse.parse(regex)
+    except Exception:
+        return []
+    return [literal for literal in _sequence_literals(parsed) if literal]
+
+def _sequence_literals(items):
+    literals = []
+    current = []
+    for op, av in items:
+        if op is sre_constants.LITERAL and av < 128:
+            current.append(chr(av))
+            continue
+        if op is sre_constants.AT:
+            continue  # Zero width anchor, the surrounding characters stay adjacent
+        literals.append(''.join(current))
+        current = []
+        if op is sre_constants.SUBPATTERN:
+            literals.extend(_sequence_literals(av[-1]))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            low, _, body = av
+            if low >= 1:
+                literals.extend(_sequence_literals(body))
+    literals.append(''.join(current))
+    return literals
+
+class TrigramQuery:
+    """Trigrams required by a regex, with the bitmask per signature size cached."""
+
+    def __init__(self, tris):
+        self.trigrams = tris
+        self._masks = {}
+
+    def mask(self, bits):
+        mask = self._masks.get(bits)
+        if mask is None:
+            mask = 0
+            for trigram in self.trigrams:
+                mask |= 1 << _bit(trigram, bits)
+            self._masks[bits] = mask
+        return mask
+
+class TrigramIndex:
+    """Per-workspace trigram signatures used to skip files a regex cannot match.
+
+    Every file gets a Bloom-style signature of the lowercased byte trigrams it
+    contains. A regex filter is planned into the trigrams of its required literals;
+    files whose signature lacks one of them are rejected without being opened.
+    Signatures are built by the filter scan itself, for files it reads anyway, so
+    the index never delays a scan with a pass of its own. They are keyed by size
+    and mtime, persisted in the ScanCache and only rebuilt for new or changed files.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.folder_path = None
+        self.max_bits = MAX_BITS
+        self._signatures = {}  # path -> (size, mtime, bits, mask)
+
+    def plan(self, regex):
+        """TrigramQuery for a content regex, or None when the index cannot help."""
+        if not regex or not regex.isascii():
+            return None  # Same condition as the byte-level regex in ContentFilter
+        tris = set()
+        for literal in required_literals(regex):
+            # The content regex ignores case with Unicode folding, which bytes.lower() does not know
+            for part in UNICODE_FOLDED.split(literal):
+                encoded = part.encode('ascii').lower()
+                # Line breaks may be \r\n on disk while the regex sees \n, leave them out
+                tris.update(int.from_bytes(trigram, 'big') for trigram in (encoded[i:i + 3] for i in range(len(encoded) - 2))
+                            if b'\n' not in trigram and b'\r' not in trigram)
+        return TrigramQuery(tris) if tris else None
+
+    def load(self, folder_path, file_count):
+        """Load the persisted signatures of a workspace and size new ones for a share of file_count files."""
+        self.max_bits = max_signature_bits(file_count)
+        if folder_path != self.folder_path:
+            self.folder_path = folder_path
+            self._signatures = self.cache.load_trigrams(folder_path) if self.cache else {}
+        if any(record[2] > self.max_bits for record in self._signatures.values()):
+            # Stored while the share was smaller; dropped so they are rebuilt within the memory budget
+            self._signatures = {path: record for path, record in self._signatures.items() if record[2] <= self.max_bits}
+
+    def has_signature(self, entry):
+        record = self._signatures.get(entry.path)
+        return record is not None and record[0] == entry.size and record[1] == entry.mtime
+
+    def record(self, signed):
+        """Keep and persist signatures computed during a scan, given as (entry, (bits, mask)) pairs."""
+        updated = {}
+        for entry, (bits, mask) in signed:
+            self._signatures[entry.path] = updated[entry.path] = (entry.size, entry.mtime, bits, mask)
+        if updated and self.cache:
+            self.cache.store_trigrams(self.folder_path, updated)
+
+    def may_match(self, entry, query):
+        record = self._signatures.get(entry.path)
+        if not record or record[0] != entry.size or record[1] != entry.mtime:
+            return True  # Unknown or stale, let the regex decide
+        _, _, bits, mask = record
+        required = query.mask(bits)
+        return mask & required == required
@@ -1,22 +1,22 @@
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QScrollArea
 from PySide6.QtCore import Qt
-import pkg_resources
 
-import_succeded = True
-try:
-    import iniforge
-except:
-    import_succeded = False
+def package_version():
+    """Installed iniForge version, read from the package metadata (not pkg_resources, which is slow to import)."""
+    from importlib.metadata import version, PackageNotFoundError
+    try:
+        return version("iniforge")
+    except PackageNotFoundError:
+        return "Not Available"
 
 class QAboutDialog(QDialog):
     def __init__(self, parent=None):
         super(QAboutDialog, self).__init__(parent)
-        global import_succeded
         self.setWindowTitle("iniForge About")
         self.leftLabelWidth = 80
         # Define the layout
         layout = QVBoxLayout()
-        self.version = pkg_resources.get_distribution("iniforge").version if import_succeded else "Not Available"
+        self.version = package_version()
         
         # Application name and version
         app_name_label = QLabel(f"<h3>iniForge: Bulk Settings Precision</h3>")
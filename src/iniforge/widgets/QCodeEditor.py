@@ -0,0 +1,82 @@
+from PySide6.QtWidgets import QPlainTextEdit, QWidget
+from PySide6.QtCore import Qt, QRect, QSize
+from PySide6.QtGui import QColor, QPainter, QTextOption
+
+class LineNumberArea(QWidget):
+    """Gutter of a QCodeEditor; all the work is done by the editor."""
+
+    def __init__(self, editor):
+        super().__init__(editor)
+        self.editor = editor
+
+    def sizeHint(self):
+        return QSize(self.editor.line_number_area_width(), 0)
+
+    def paintEvent(self, event):
+        self.editor.paint_line_numbers(event)
+
+class QCodeEditor(QPlainTextEdit):
+    """Plain text editor with a painted line-number gutter.
+
+    Numbers are painted from the blocks currently on screen, so a repaint
+    costs O(visible lines) whatever the file length, and they share the
+    editor's own scrolling and block geometry, so they always line up.
+    """
+
+    GUTTER_PADDING = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWordWrapMode(QTextOption.NoWrap)
+        self.gutter_background = QColor("ivory")
+        self.gutter_foreground = QColor(Qt.darkGray)
+        self.line_number_area = LineNumberArea(self)
+        self.blockCountChanged.connect(self.update_line_number_area_width)
+        self.updateRequest.connect(self.update_line_number_area)
+        self.update_line_number_area_width()
+
+    def line_number_area_width(self):
+        digits = max(4, len(str(self.blockCount())))
+        return self.fontMetrics().horizontalAdvance('9' * digits) + 2 * self.GUTTER_PADDING
+
+    def set_gutter_colors(self, background, foreground):
+        self.gutter_background = QColor(background)
+        self.gutter_foreground = QColor(foreground)
+        self.line_number_area.update()
+
+    def update_line_number_area_width(self, block_count=0):
+        self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
+
+    def update_line_number_area(self, rect, dy):
+        # Scrolling moves the painted numbers with the text, anything else repaints the damaged strip
+        if dy:
+            self.line_number_area.scroll(0, dy)
+        else:
+            self.line_number_area.update(0, rect.y(), self.line_number_area.width(), rect.height())
+        if rect.contains(self.viewport().rect()):
+            self.update_line_number_area_width()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        contents = self.contentsRect()
+        self.line_number_area.setGeometry(QRect(contents.left(), contents.top(),
+                                                self.line_number_area_width(), contents.height()))
+
+    def paint_line_numbers(self, event):
+        painter = QPainter(self.line_number_area)
+        painter.fillRect(event.rect(), self.gutter_background)
+        painter.setPen(self.gutter_foreground)
+        width = self.line_number_area.width() - self.GUTTER_PADDING
+        height = self.fontMetrics().height()
+
+        block = self.firstVisibleBlock()
+        number = block.blockNumber()
+        top = round(self.blockBoundingGeometry(block).translated(self.contentOffset()).top())
+        bottom = top + round(self.blockBoundingRect(block).height())
+        while block.isValid() and top <= event.rect().bottom():
+            if block.isVisible() and bottom >= event.rect().top():
+                painter.drawText(0, top, width, height, Qt.AlignRight, str(number + 1).zfill(4))  # Zero-padded, as the old line number column
+            block = block.next()
+            top = bottom
+            bottom = top + round(self.blockBoundingRect(block).height())
+            number += 1
@@ -0,0 +1,234 @@
+import os
+import bisect
+from array import array
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+class QFileListModel(QAbstractListModel):
+    """File list of the file directory, for a QListView.
+
+    Paths are stored compactly: each directory string once, and per file only
+    its name plus the index of its directory in an array. Rows are a second
+    array of storage indices, so sorting or grouping rearranges integers
+    instead of items. Batches streamed by the filter are appended with a
+    single row insertion. The display text is the file name, or the path
+    relative to the root folder when grouped by directory; Qt.UserRole holds
+    the full path.
+    """
+
+    FOUND_ORDER = 'found'  # The order the paths were added in (inventory order)
+    BY_NAME = 'name'
+    BY_DIRECTORY = 'directory'  # Grouped by directory, then by name
+    SORT_MODES = (FOUND_ORDER, BY_NAME, BY_DIRECTORY)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = ''
+        self.sort_mode = self.FOUND_ORDER
+        self._reset_storage()
+
+    def _reset_storage(self):
+        self._directories = []  # Directory strings, trailing separator included
+        self._directory_ids = {}  # directory -> index in _directories
+        self._directory_keys = []  # Case-folded directories, for sorting
+        self._file_directories = array('I')  # Per stored file: index of its directory
+        self._names = []  # Per stored file: its name
+        self._listed = []  # Per directory: names of its files that have a row, so a path is listed once
+        self._rows = array('I')  # Row -> stored file
+        self._row_keys = []  # (sort key, stored file) per row while sorted, empty in found order
+
+    # Storage
+
+    @staticmethod
+    def _split(file_path):
+        cut = max(file_path.rfind(os.sep), file_path.rfind('/')) + 1
+        return file_path[:cut], file_path[cut:]
+
+    def _store(self, file_path):
+        directory, name = self._split(file_path)
+        directory_id = self._directory_ids.get(directory)
+        if directory_id is None:
+            directory_id = self._directory_ids[directory] = len(self._directories)
+            self._directories.append(directory)
+            self._directory_keys.append(directory.casefold())
+            self._listed.append(set())
+        self._file_directories.append(directory_id)
+        self._names.append(name)
+        self._listed[directory_id].add(name)
+        return len(self._names) - 1
+
+    def _path(self, stored):
+        return self._directories[self._file_directories[stored]] + self._names[stored]
+
+    def _sort_key(self, stored):
+        name = self._names[stored].casefold()
+        if self.sort_mode == self.BY_DIRECTORY:
+            return (self._directory_keys[self._file_directories[stored]], name)
+        return (name,)
+
+    # Model interface
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        stored = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return self.display_text(index.row())
+        if role in (Qt.UserRole, Qt.ToolTipRole):
+            return self._path(stored)
+        return None
+
+    def display_text(self, row):
+        stored = self._rows[row]
+        if self.sort_mode == self.BY_DIRECTORY and self.root:
+            return os.path.relpath(self._path(stored), self.root)
+        return self._names[stored]
+
+    # Paths
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, file_path):
+        directory, name = self._split(file_path)
+        directory_id = self._directory_ids.get(directory)
+        return directory_id is not None and name in self._listed[directory_id]
+
+    def path(self, row):
+        return self._path(self._rows[row])
+
+    def paths(self):
+        """Full paths in row order."""
+        return [self._path(stored) for stored in self._rows]
+
+    def set_root(self, folder_path):
+        """Folder the grouped display is relative to."""
+        self.root = folder_path or ''
+        if self.sort_mode == self.BY_DIRECTORY and self._rows:
+            self.dataChanged.emit(self.index(0), self.index(len(self._rows) - 1), [Qt.DisplayRole])
+
+    def clear(self):
+        self.beginResetModel()
+        self._reset_storage()
+        self.endResetModel()
+
+    def append_paths(self, file_paths):
+        """Add a batch of paths: one row insertion in found order, one merge when sorted.
+
+        Paths already listed are skipped, so overlapping batches never duplicate a row.
+        """
+        stored = [self._store(file_path) for file_path in dict.fromkeys(file_paths) if file_path not in self]
+        if not stored:
+            return
+        if self.sort_mode == self.FOUND_ORDER:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(stored) - 1)
+            self._rows.extend(stored)
+            self.endInsertRows()
+            return
+        if not self._rows:
+            self.beginInsertRows(QModelIndex(), 0, len(stored) - 1)
+            self._merge_sorted(stored)
+            self.endInsertRows()
+            return
+        self._relayout(lambda: self._merge_sorted(stored))
+
+    def remove_paths(self, file_paths):
+        """Drop the rows of the given paths, a contiguous run of rows at a time."""
+        file_paths = set(file_paths)
+        removed = [row for row, stored in enumerate(self._rows) if self._path(stored) in file_paths]
+        if not removed:
+            return
+        # Contiguous runs, removed bottom up so the row numbers still to remove stay valid
+        runs = []
+        for row in removed:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        for row in removed:
+            stored = self._rows[row]
+            self._listed[self._file_directories[stored]].discard(self._names[stored])
+        for first, last in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._rows[first:last + 1]
+            del self._row_keys[first:last + 1]
+            self.endRemoveRows()
+        self._compact()
+
+    def _compact(self):
+        """Forget stored files no row refers to any more (rows are unchanged, no signal)."""
+        if len(self._rows) * 2 > len(self._names):
+            return  # Mostly still in use, not worth rebuilding yet
+        # Renumbered in storage order, so the found order survives
+        live = sorted(self._rows)
+        paths = [self._path(stored) for stored in live]
+        rows = self._rows
+        self._reset_storage()
+        renumbered = {old: self._store(file_path) for old, file_path in zip(live, paths)}
+        self._rows = array('I', (renumbered[stored] for stored in rows))
+        if self.sort_mode != self.FOUND_ORDER:
+            self._row_keys = [(self._sort_key(stored), stored) for stored in self._rows]
+
+    # Sorting
+
+    def set_sort_mode(self, mode):
+        """Reorder the rows in place; in found order they go back to the order they were added in."""
+        if mode not in self.SORT_MODES or mode == self.sort_mode:
+            return
+        self.sort_mode = mode
+        self._relayout(self._sort_all)  # The view re-reads every visible row, display texts included
+
+    def _sort_all(self):
+        rows = sorted(self._rows)  # Stored indices grow as paths are added: this is the found order
+        self._rows = array('I')
+        self._row_keys = []
+        if self.sort_mode == self.FOUND_ORDER:
+            self._rows = array('I', rows)
+        else:
+            self._merge_sorted(rows)
+
+    def _merge_sorted(self, stored):
+        # Keys end with the stored index, so ties keep the found order
+        batch = sorted((self._sort_key(stored_file), stored_file) for stored_file in stored)
+        keys = self._row_keys
+        if len(batch) * 8 < len(keys):
+            # Small batch into a long list: binary search each position, then copy slices once
+            merged_keys = []
+            merged_rows = array('I')
+            previous = 0
+            for entry in batch:
+                row = bisect.bisect_left(keys, entry, previous)
+                merged_keys.extend(keys[previous:row])
+                merged_rows.extend(self._rows[previous:row])
+                merged_keys.append(entry)
+                merged_rows.append(entry[1])
+                previous = row
+            merged_keys.extend(keys[previous:])
+            merged_rows.extend(self._rows[previous:])
+            self._row_keys = merged_keys
+            self._rows = merged_rows
+        else:
+            # Timsort merges the two sorted runs in linear time
+            keys.extend(batch)
+            keys.sort()
+            self._rows = array('I', (stored_file for _, stored_file in keys))
+
+    def _relayout(self, reorder):
+        """Run reorder() as one layout change, keeping selections and the current row on their files."""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        stored = [self._rows[index.row()] if index.row() < len(self._rows) else None for index in persistent]
+        reorder()
+        if persistent:
+            # Usually just the current and selected rows: a C-level search each beats mapping every row
+            if len(persistent) <= 16:
+                rows = {stored_file: self._rows.index(stored_file) for stored_file in stored if stored_file is not None}
+            else:
+                rows = {stored_file: row for row, stored_file in enumerate(self._rows)}
+            self.changePersistentIndexList(persistent, [
+                self.index(rows[stored_file]) if stored_file in rows else QModelIndex()
+                for stored_file in stored])
+        self.layoutChanged.emit()
@@ -0,0 +1,216 @@
+import os
+import mmap
+from PySide6.QtWidgets import QAbstractScrollArea, QInputDialog
+from PySide6.QtCore import Qt, QTimer, Signal, QRect
+from PySide6.QtGui import QFont, QFontMetrics, QPainter, QColor, QPalette, QKeySequence
+from ..line_index import LineIndex
+from .. import core
+
+class QLargeFileViewer(QAbstractScrollArea):
+    """Read-only viewer for files too large to load into a text widget.
+
+    The file is memory-mapped and a LineIndex of its line offsets is built a
+    chunk per event loop pass, so the first lines show at once and the UI stays
+    responsive while the rest is indexed. Only the lines in the viewport are
+    decoded and painted; the vertical scroll bar counts lines, so scrolling
+    and jumping to a line cost the same anywhere in the file.
+    """
+
+    # Lines indexed so far, and whether the whole file is indexed
+    indexProgress = Signal(int, bool)
+
+    GUTTER_PADDING = 6
+    TEXT_MARGIN = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFont(QFont("Courier New", 10))
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.file_path = None
+        self.index = None
+        self._file = None
+        self._view = None
+        self.current_line = -1  # Highlighted line (jump target or search match), -1 for none
+        self.match = None  # (start, end) byte offsets of the highlighted search match
+        self.text_width = 0  # Widest line painted so far, in pixels
+        self._index_timer = QTimer(self)
+        self._index_timer.setInterval(0)
+        self._index_timer.timeout.connect(self._index_step)
+
+    # File
+
+    def open_file(self, file_path):
+        self.close_file()
+        self._file = open(file_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._view = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.file_path = file_path
+        self.index = LineIndex(self._view)
+        self._index_step()
+        if not self.index.complete:
+            self._index_timer.start()
+
+    def close_file(self):
+        """Release the mapping (on Windows a mapped file cannot be replaced by a bulk apply)."""
+        self._index_timer.stop()
+        self.index = None
+        if isinstance(self._view, mmap.mmap):
+            self._view.close()
+        self._view = None
+        if self._file:
+            self._file.close()
+            self._file = None
+        self.file_path = None
+        self.current_line = -1
+        self.match = None
+        self.text_width = 0
+        self._update_scroll_bars()
+        self.viewport().update()
+
+    def _index_step(self):
+        done = self.index.index_step()
+        if done:
+            self._index_timer.stop()
+        self._update_scroll_bars()
+        self.viewport().update()
+        self.indexProgress.emit(self.index.line_count(), done)
+
+    def line_count(self):
+        return self.index.line_count() if self.index else 0
+
+    # Geometry
+
+    def line_height(self):
+        return QFontMetrics(self.font()).height()
+
+    def visible_lines(self):
+        return max(1, self.viewport().height() // self.line_height())
+
+    def gutter_width(self):
+        digits = max(4, len(str(self.line_count())))
+        return QFontMetrics(self.font()).horizontalAdvance('9' * digits) + 2 * self.GUTTER_PADDING
+
+    def _update_scroll_bars(self):
+        visible = self.visible_lines()
+        self.verticalScrollBar().setRange(0, max(0, self.line_count() - visible))
+        self.verticalScrollBar().setPageStep(visible)
+        text_area = self.viewport().width() - self.gutter_width() - self.TEXT_MARGIN
+        self.horizontalScrollBar().setRange(0, max(0, self.text_width - text_area))
+        self.horizontalScrollBar().setPageStep(max(1, text_area))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scroll_bars()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    # Navigation
+
+    def go_to_line(self, line_number):
+        """Show and highlight a 1-based line, centred in the viewport. Returns False if out of range."""
+        line = line_number - 1
+        if not 0 <= line < self.line_count():
+            return False
+        self.current_line = line
+        self.match = None
+        self.verticalScrollBar().setValue(line - self.visible_lines() // 2)
+        self.viewport().update()
+        return True
+
+    def prompt_go_to_line(self):
+        if not self.line_count():
+            return
+        current = self.current_line + 1 if self.current_line >= 0 else self.verticalScrollBar().value() + 1
+        line_number, ok = QInputDialog.getInt(self, "Go to Line", f"Line (1 - {self.line_count()}):",
+                                              current, 1, self.line_count())
+        if ok:
+            self.go_to_line(line_number)
+
+    def find(self, text, case_sensitive=False, backwards=False):
+        """Highlight the next match of text after the current one (or the top of the view). Returns True if found."""
+        if not self.index:
+            return False
+        if self.match:
+            offset = self.match[0] if backwards else self.match[0] + 1
+        else:
+            offset = self.index.starts[min(self.verticalScrollBar().value(), len(self.index.starts) - 1)]
+        found = self.index.find(text, offset, case_sensitive, backwards)
+        if found is None:
+            # Wrap around, like the match navigation of the editor
+            found = self.index.find(text, self.index.size if backwards else 0, case_sensitive, backwards)
+        if found is None:
+            return False
+        line = self.index.line_at(found[0])
+        if line >= self.line_count():
+            return False  # Past the part indexed so far
+        self.go_to_line(line + 1)
+        self.match = found
+        return True
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.MoveToStartOfDocument):
+            self.verticalScrollBar().setValue(0)
+        elif event.matches(QKeySequence.MoveToEndOfDocument):
+            self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        elif event.key() == Qt.Key_G and event.modifiers() & Qt.ControlModifier:
+            self.prompt_go_to_line()
+        else:
+            super().keyPressEvent(event)
+
+    # Painting
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        palette = self.palette()
+        painter.fillRect(event.rect(), palette.color(QPalette.Base))
+        gutter = self.gutter_width()
+        if self.index:
+            self._paint_lines(painter, palette, gutter)
+        # Gutter last, so text scrolled to the left slides under it
+        painter.fillRect(QRect(0, 0, gutter, self.viewport().height()), palette.color(QPalette.AlternateBase))
+        if self.index:
+            self._paint_line_numbers(painter, palette, gutter)
+
+    def _visible_range(self):
+        first = self.verticalScrollBar().value()
+        return range(first, min(self.line_count(), first + self.visible_lines() + 1))
+
+    def _paint_lines(self, painter, palette, gutter):
+        metrics = QFontMetrics(self.font())
+        height = metrics.height()
+        x = gutter + self.TEXT_MARGIN - self.horizontalScrollBar().value()
+        widest = self.text_width
+        for row, line in enumerate(self._visible_range()):
+            top = row * height
+            text = self.index.line_text(line).expandtabs(4)
+            if line == self.current_line:
+                painter.fillRect(QRect(gutter, top, self.viewport().width() - gutter, height), QColor(255, 255, 170))
+                if self.match:
+                    self._paint_match(painter, metrics, line, x, top, height)
+                painter.setPen(QColor(Qt.black))
+            else:
+                painter.setPen(palette.color(QPalette.Text))
+            painter.drawText(x, top + metrics.ascent(), text)
+            widest = max(widest, metrics.horizontalAdvance(text))
+        if widest != self.text_width:
+            self.text_width = widest
+            self._update_scroll_bars()
+
+    def _paint_match(self, painter, metrics, line, x, top, height):
+        start, end = self.index.line_span(line)
+        data = self.index.data
+        prefix = data[start:max(start, self.match[0])].decode(core.ENCODING, errors='replace').expandtabs(4)
+        matched = data[self.match[0]:min(end, self.match[1])].decode(core.ENCODING, errors='replace')
+        left = x + metrics.horizontalAdvance(prefix)
+        painter.fillRect(QRect(left, top, metrics.horizontalAdvance(matched), height), QColor(Qt.yellow))
+
+    def _paint_line_numbers(self, painter, palette, gutter):
+        metrics = QFontMetrics(self.font())
+        height = metrics.height()
+        painter.setPen(palette.color(QPalette.PlaceholderText))
+        for row, line in enumerate(self._visible_range()):
+            number = str(line + 1)
+            painter.drawText(gutter - self.GUTTER_PADDING - metrics.horizontalAdvance(number),
+                             row * height + metrics.ascent(), number)
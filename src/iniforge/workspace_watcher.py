@@ -0,0 +1,101 @@
+from PySide6.QtCore import QObject, QTimer, QFileSystemWatcher, Signal
+
+class WorkspaceWatcher(QObject):
+    """Keeps a WorkspaceInventory in sync with the file system.
+
+    Directories are watched with QFileSystemWatcher (files created, deleted or
+    renamed). Directories the watcher refuses (e.g. inotify limit reached) and
+    in-place content modifications, which directory watches do not report, are
+    picked up by a periodic stat sweep over a rotating slice of the inventory.
+    """
+    # added, removed, modified file paths
+    changed = Signal(list, list, list)
+
+    DEBOUNCE_MS = 500
+    POLL_SLICE = 2000
+
+    def __init__(self, inventory, poll_interval=10, parent=None):
+        super().__init__(parent)
+        self.inventory = inventory
+        self.poll_interval = poll_interval
+        self._dirty_dirs = set()
+        self._polled_dirs = []
+        self._poll_position = 0
+        self._fs_watcher = None
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.timeout.connect(self._flush)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.timeout.connect(self._poll)
+
+    def start(self):
+        self.stop()
+        self._fs_watcher = QFileSystemWatcher(self)
+        self._fs_watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watch(self.inventory.directories())
+        if self.poll_interval > 0:
+            self._poll_timer.start(int(self.poll_interval * 1000))
+
+    def stop(self):
+        self._debounce_timer.stop()
+        self._poll_timer.stop()
+        self._dirty_dirs.clear()
+        self._polled_dirs = []
+        self._poll_position = 0
+        if self._fs_watcher is not None:
+            self._fs_watcher.directoryChanged.disconnect(self._on_directory_changed)
+            self._fs_watcher.deleteLater()
+            self._fs_watcher = None
+
+    def is_active(self):
+        return self._fs_watcher is not None
+
+    def _watch(self, directories):
+        if not directories:
+            return
+        failed = self._fs_watcher.addPaths(directories)
+        if failed:
+            print(f"File system watcher unavailable for {len(failed)} directories, polling them instead")
+            self._polled_dirs.extend(failed)
+
+    def _on_directory_changed(self, dir_path):
+        self._dirty_dirs.add(dir_path)
+        self._debounce_timer.start(self.DEBOUNCE_MS)
+
+    def _flush(self):
+        added, removed, modified = [], [], []
+        known_dirs = set(self.inventory.directories())
+        for dir_path in sorted(self._dirty_dirs):
+            a, r, m = self.inventory.refresh_directory(dir_path)
+            added += a
+            removed += r
+            modified += m
+        self._dirty_dirs.clear()
+
+        # Keep the watch list in step with directories that appeared or vanished
+        current_dirs = set(self.inventory.directories())
+        if self._fs_watcher is not None:
+            gone = [d for d in known_dirs - current_dirs if d in self._fs_watcher.directories()]
+            if gone:
+                self._fs_watcher.removePaths(gone)
+            self._watch(sorted(current_dirs - known_dirs))
+        self._polled_dirs = [d for d in self._polled_dirs if d in current_dirs]
+
+        if added or removed or modified:
+            self.changed.emit(added, removed, modified)
+
+    def _poll(self):
+        if self._polled_dirs:
+            self._dirty_dirs.update(self._polled_dirs)
+        paths = self.inventory.paths()
+        if self._poll_position >= len(paths):
+            self._poll_position = 0
+        chunk = paths[self._poll_position:self._poll_position + self.POLL_SLICE]
+        self._poll_position += self.POLL_SLICE
+        removed, modified = self.inventory.refresh_files(chunk)
+        if self._dirty_dirs:
+            self._flush()
+        if removed or modified:
+            self.changed.emit([], removed, modified)
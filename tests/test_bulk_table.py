@@ -0,0 +1,37 @@
+import json
+import os
+import pytest
+from iniforge.bulk_table import BulkTable, TableError, load_table
+
+def write_json(tmp_path, data):
+    table_path = tmp_path / 'table.json'
+    table_path.write_text(json.dumps(data), encoding='utf-8')
+    return str(table_path)
+
+def test_nested_json_table(tmp_path):
+    rows = load_table(write_json(tmp_path, {'db1': {'main': {'port': 80, 'old': None}}}))
+    assert rows == [
+        {'file': 'db1', 'section': 'main', 'key': 'port', 'value': '80', 'action': 'set'},
+        {'file': 'db1', 'section': 'main', 'key': 'old', 'value': '', 'action': 'delete'},
+    ]
+
+@pytest.mark.parametrize('data, offending', [
+    ({'h': 'x'}, "'h'"),
+    ({'h': ['main']}, "'h'"),
+    ({'h': {'main': 'x'}}, "'main'"),
+    ({'h': {'main': None}}, "'main'"),
+    ([{'file': 'h'}], 'Row 1'),
+    ('rows', 'JSON table'),
+])
+def test_malformed_json_table(tmp_path, data, offending):
+    with pytest.raises(TableError, match=offending):
+        load_table(write_json(tmp_path, data))
+
+def test_globs_ignore_case(tmp_path):
+    folder = str(tmp_path)
+    paths = [os.path.join(folder, 'sub', 'db1.INI'), os.path.join(folder, 'sub', 'web.ini'), os.path.join(folder, 'top.ini')]
+    rows = [{'file': 'sub/*.ini', 'section': 's', 'key': 'k', 'value': 'v', 'action': 'set'},
+            {'file': 'DB1', 'section': 's', 'key': 'k', 'value': 'v', 'action': 'set'}]
+    plans, unmatched = BulkTable(rows).plans(folder, paths)
+    assert sorted(plans) == sorted(paths[:2])
+    assert unmatched == rows[1:]  # File keys are exact
@@ -0,0 +1,77 @@
+import re
+import random
+import pytest
+from iniforge import core
+from iniforge.cli import PlanError, normalize_operation
+
+@pytest.mark.parametrize('replacement', [r'C:\path', r'\9', r'\g<name>', '\\'])
+def test_invalid_replacement_template(replacement):
+    with pytest.raises(re.error):
+        core.check_regex_replacement(r'(?P<key>\w+)=(\d+)', replacement, True)
+    with pytest.raises(PlanError, match='invalid replacement'):
+        normalize_operation({'type': 'regex_replace', 'pattern': r'(?P<key>\w+)=(\d+)', 'replacement': replacement}, 1)
+
+@pytest.mark.parametrize('replacement', [r'\2=\1', r'\g<key>=\g<2>', r'C:\\path', 'plain'])
+def test_valid_replacement_template(replacement):
+    core.check_regex_replacement(r'(?P<key>\w+)=(\d+)', replacement, True)
+    assert normalize_operation({'type': 'regex_replace', 'pattern': r'(?P<key>\w+)=(\d+)', 'replacement': replacement}, 1)
+
+# Streaming edits (stream_plan) must give exactly the in-memory result
+
+TOKENS = ['[A]\n', '[B]\n', '; c\n', 'k=1\n', 'k=1', 'x\n', '\n', '  [A]  \n', '[A]', 'k', '=1\n', 'k=1\r\n']
+
+def random_text(rng):
+    return ''.join(rng.choice(TOKENS) for _ in range(rng.randint(0, 10)))
+
+def random_streamable_operation(rng):
+    kind = rng.choice(['insert', 'replace', 'remove'])
+    if kind == 'insert':
+        return {'type': 'insert', 'section': rng.choice(['A', 'B', 'C']), 'add_at_start': rng.random() < 0.5,
+                'config_lines': rng.choice([['n=1\n'], ['n=1\n', 'm=2\n']])}
+    operation = {'type': kind, 'filter_text': rng.choice(['k=1', 'k=1\nx', 'x\n\nk=1', '[A]\nk=1', ' ', 'k']),
+                 'include_blank': rng.random() < 0.5}
+    if kind == 'replace':
+        operation['replace_text'] = rng.choice(['k=2', '', 'a\nb', 'k=1'])
+    return operation
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 4096])
+def test_stream_replace_is_str_replace(chunk_size):
+    rng = random.Random(chunk_size)
+    for _ in range(2000):
+        text = random_text(rng)
+        old = rng.choice(['k=1', 'k=1\nx', '\n', 'A]\n[', 'x\n\nk', 'k=1\r\n'])
+        new = rng.choice(['', 'k=2', 'a\nb'])
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        assert ''.join(core.stream_replace(chunks, old, new)) == text.replace(old, new)
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 5, 4096])
+def test_stream_insertion_is_transform_insertion(chunk_size):
+    rng = random.Random(chunk_size)
+    for _ in range(2000):
+        text = random_text(rng)
+        operation = random_streamable_operation(rng)
+        if operation['type'] != 'insert':
+            continue
+        args = operation['section'], operation['config_lines'], operation['add_at_start']
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        assert ''.join(core.stream_insertion(chunks, *args)) == core.transform_insertion(text, *args), (text, operation)
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 64])
+def test_stream_plan_matches_in_memory_apply(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(core, 'STREAM_CHUNK_SIZE', chunk_size)
+    rng = random.Random(16 + chunk_size)
+    in_memory, streamed = tmp_path / 'in_memory.ini', tmp_path / 'streamed.ini'
+    compared = 0
+    for _ in range(1500):
+        text = random_text(rng)
+        operations = [random_streamable_operation(rng) for _ in range(rng.randint(1, 3))]
+        for file_path in (in_memory, streamed):
+            file_path.write_bytes(text.encode('ascii'))
+        if not core._can_stream(operations):
+            continue
+        modified = core.apply_plan(str(in_memory), operations)
+        streamed_modified = core.apply_plan(str(streamed), operations, streaming_threshold=0.5)
+        assert streamed.read_bytes() == in_memory.read_bytes(), (text, operations)
+        assert streamed_modified == modified
+        compared += 1
+    assert compared > 1000
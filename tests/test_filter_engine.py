@@ -0,0 +1,56 @@
+import re
+import random
+import pytest
+from iniforge import core
+from iniforge.filter_engine import ContentFilter
+
+def reference_match(regex, raw):
+    """What the text-mode filter answers: the str regex over the decoded content."""
+    return re.search(regex, core.decode_text(raw), re.IGNORECASE | re.DOTALL) is not None
+
+def regex_filter_matches(tmp_path, regex, raw):
+    file_path = tmp_path / 'settings.ini'
+    file_path.write_bytes(raw)
+    return ContentFilter('', [], regex, regex_mode=True).matches(str(file_path))
+
+@pytest.mark.parametrize('regex, text, expected', [
+    ('a.b', 'x=aéb\n', True),
+    (r'user=\w{4}$', 'user=café', True),
+    ('name=[^x]z', 'name=éz\n', True),
+    (r'\bfoo\b', 'éfoo bar\n', False),
+    ('CAFÉ', 'name=café\n', True),
+])
+def test_regex_on_non_ascii_content(tmp_path, regex, text, expected):
+    try:
+        raw = text.encode(core.ENCODING)
+    except UnicodeEncodeError:
+        pytest.skip(f"{core.ENCODING} cannot encode {text!r}")
+    assert regex_filter_matches(tmp_path, regex, raw) is expected
+    assert reference_match(regex, raw) is expected
+
+@pytest.mark.parametrize('regex', [r'port=80..\s', r'80\s{3}', r'port=\d+\s\s\s\s', r'80\r'])
+def test_regex_on_crlf_content_sees_universal_newlines(tmp_path, regex):
+    raw = b'port=80\r\n\r\nhost=a\r\n'
+    assert regex_filter_matches(tmp_path, regex, raw) is False
+    assert reference_match(regex, raw) is False
+
+@pytest.mark.parametrize('regex', [r'port=80\s+host', r'80\n\nhost', 'HOST=A$'])
+def test_regex_on_crlf_content_matches(tmp_path, regex):
+    assert regex_filter_matches(tmp_path, regex, b'port=80\r\n\r\nhost=a\r\n') is True
+
+def test_regex_matches_like_text_mode_filter(tmp_path):
+    rng = random.Random(6)
+    regexes = ['a.b', r'\w+$', '^host', r'=\s*$', r'\n\n', r'[^a]\n', r'80\s{2}', 'x.y']
+    pieces = ['a', 'b', 'x', 'y', '\r', '\n', ' ', '=', '80', 'host']
+    for _ in range(300):
+        raw = ''.join(rng.choice(pieces) for _ in range(rng.randrange(15))).encode('ascii')
+        for regex in regexes:
+            assert regex_filter_matches(tmp_path, regex, raw) == reference_match(regex, raw), (regex, raw)
+
+def test_content_lines_on_crlf_content(tmp_path):
+    file_path = tmp_path / 'settings.ini'
+    file_path.write_bytes(b'[main]\r\nport=80\r\n')
+    content_filter = ContentFilter('[main]\nport=80', ['[main]', 'port=80'], '', include_blank_lines=True)
+    assert content_filter.matches(str(file_path))
+    content_filter = ContentFilter('port=80\nhost', ['port=80', 'host'], '')
+    assert not content_filter.matches(str(file_path))
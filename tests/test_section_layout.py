@@ -0,0 +1,40 @@
+import io
+import random
+import pytest
+from iniforge import core
+from iniforge.section_layout import InsertionBatch, SectionLayout, split_lines
+
+TOKENS = ['[A]\n', '[B]\n', '; c\n', 'k=1\n', 'k=1', 'x\n', '\n', '  [A]  \n', '[A]', '[C', '# h\n', '[]\n']
+CONFIGS = [['n=1\n'], ['n=1\n', 'm=2\n'], ['; c\n'], ['[Z]\n'], [], ['x']]
+
+@pytest.mark.parametrize('text', ['', 'a', 'a\n', 'a\nb', '\n\n', '[A]\n\nk=1'])
+def test_split_lines_is_readlines(text):
+    assert split_lines(text) == io.StringIO(text).readlines()
+
+def test_insertion_index():
+    layout = SectionLayout(split_lines('[A]\n; c\nk=1\n[B]\nx=2\n'))
+    assert layout.insertion_index('A', add_at_start=True) == (2, True)
+    assert layout.insertion_index('A') == (3, True)
+    assert layout.insertion_index('B') == (5, True)
+    assert layout.insertion_index('C') == (5, False)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_batch_matches_sequential_insertions(seed):
+    rng = random.Random(seed)
+    for _ in range(5000):
+        text = ''.join(rng.choice(TOKENS) for _ in range(rng.randint(0, 8)))
+        operations = [{'type': 'insert', 'section': rng.choice(['A', 'B', 'C', '', 'Z']),
+                       'config_lines': rng.choice(CONFIGS), 'add_at_start': rng.random() < 0.5}
+                      for _ in range(rng.randint(1, 5))]
+        expected = text
+        for operation in operations:
+            expected = core.transform_insertion(expected, operation['section'], operation['config_lines'],
+                                                operation['add_at_start'])
+        assert core.transform_insertions(text, operations) == expected, (text, operations)
+
+def test_batch_keeps_base_lines():
+    base = split_lines('[A]\nk=1\n')
+    batch = InsertionBatch(base)
+    batch.insert('A', ['n=1\n'], False)
+    assert base == ['[A]\n', 'k=1\n']
+    assert batch.lines() == ['[A]\n', 'k=1\n', 'n=1\n']
@@ -0,0 +1,96 @@
+import os
+import re
+import random
+import pytest
+from iniforge.filter_engine import ContentFilter, filter_paths
+from iniforge.inventory import FileEntry
+from iniforge import trigram_index
+from iniforge.trigram_index import TrigramIndex, make_signature, max_signature_bits, trigrams
+
+def write_share(tmp_path, texts):
+    entries = []
+    for i, text in enumerate(texts):
+        file_path = tmp_path / f'{i}.ini'
+        file_path.write_bytes(text.encode('utf-8'))
+        stat = os.stat(file_path)
+        entries.append(FileEntry(str(file_path), file_path.name, stat.st_size, stat.st_mtime_ns))
+    return entries
+
+def signed_index(tmp_path, texts):
+    """Index whose signatures were all built by a filter scan, as FileFilterWorker does."""
+    entries = write_share(tmp_path, texts)
+    index = TrigramIndex()
+    index.load(str(tmp_path), len(entries))
+    paths = [entry.path for entry in entries]
+    content_filter = ContentFilter('', [], 'x', regex_mode=True)
+    content_filter.sign_time = float('-inf')  # No budget, so every file is signed
+    signatures = {}
+    list(filter_paths(content_filter, paths, 1, sign_paths=set(paths), on_signature=signatures.__setitem__,
+                      signature_bits=index.max_bits))
+    index.record((entry, signatures[entry.path]) for entry in entries)
+    assert all(index.has_signature(entry) for entry in entries)
+    return index, entries
+
+@pytest.mark.parametrize('regex, text', [
+    ('max_size', 'x=max_ſize\n'),
+    ('kilo_key', 'kilo_Key\n'),
+    ('Image', 'İmage\n'),
+    ('PORT=80', 'port=80\r\n'),
+    ('host\nport', 'host\r\nport\r\n'),
+])
+def test_never_prunes_a_file_the_regex_matches(tmp_path, regex, text):
+    index, entries = signed_index(tmp_path, [text])
+    assert re.search(regex, text.replace('\r\n', '\n'), re.IGNORECASE | re.DOTALL)
+    query = index.plan(regex)
+    assert query is None or index.may_match(entries[0], query)
+
+def test_prunes_files_without_the_required_literals(tmp_path):
+    rng = random.Random(8)
+    words = [''.join(rng.choice('abcdefghjlmnopqrtuvwxyz_') for _ in range(8)) for _ in range(300)]
+    texts = ['\n'.join(rng.sample(words, 40)) for _ in range(50)]
+    index, entries = signed_index(tmp_path, texts)
+    pruned = 0
+    for word in words[:50]:
+        query = index.plan(word)
+        for entry, text in zip(entries, texts):
+            if word in text:
+                assert index.may_match(entry, query)
+            pruned += not index.may_match(entry, query)
+    assert pruned > 0.8 * sum(word not in text for word in words[:50] for text in texts)
+
+def test_unsigned_and_stale_files_are_never_pruned(tmp_path):
+    entries = write_share(tmp_path, ['a=1\n'])
+    index = TrigramIndex()
+    index.load(str(tmp_path), 1)
+    query = index.plan('something_else')
+    assert not index.has_signature(entries[0]) and index.may_match(entries[0], query)
+    index.record([(entries[0], make_signature(trigrams(b'a=1\n')))])
+    assert not index.may_match(entries[0], query)
+    entries[0].mtime += 1
+    assert not index.has_signature(entries[0]) and index.may_match(entries[0], query)
+
+def test_signatures_use_every_bit_position():
+    rng = random.Random(1)
+    tris = {rng.randrange(1 << 24) for _ in range(100000)}
+    for bits in (512, 4096):
+        assert len({trigram_index._bit(trigram, bits) for trigram in tris}) == bits
+
+def test_signature_size_follows_the_share():
+    assert max_signature_bits(100) == trigram_index.MAX_BITS
+    for file_count in (10000, 100000, 1000000):
+        bits = max_signature_bits(file_count)
+        assert trigram_index.MIN_BITS <= bits < trigram_index.MAX_BITS
+        assert bits == trigram_index.MIN_BITS or file_count * bits // 8 <= trigram_index.SIGNATURES_MEMORY
+    many = set(range(0, 1 << 24, 97))
+    assert make_signature(many, 2048)[0] == 2048
+
+def test_signing_budget_limits_the_scan(tmp_path):
+    rng = random.Random(2)
+    texts = [''.join(f'k{rng.randrange(10 ** 6)}=v{rng.randrange(10 ** 6)}\n' for _ in range(2000)) for _ in range(40)]
+    entries = write_share(tmp_path, texts)
+    paths = [entry.path for entry in entries]
+    content_filter = ContentFilter('', [], 'k1=', regex_mode=True)
+    signatures = {}
+    results = list(filter_paths(content_filter, paths, 1, sign_paths=set(paths), on_signature=signatures.__setitem__))
+    assert [matched for _, matched in results] == [bool(re.search('k1=', text)) for text in texts]
+    assert 0 < len(signatures) < len(paths)